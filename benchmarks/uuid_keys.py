@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import time
+import uuid
+from sqlalchemy import Column, DateTime, MetaData, Table, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from core.ids import uuid7
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+# Shaped like notifications: uuid primary key plus a little payload
+def _table(metadata: MetaData, name: str) -> Table:
+    return Table(
+        f"bench_{name}_keys", metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("payload", Text, nullable=False),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+def _sizes(conn, table: Table) -> dict:
+    row = conn.execute(
+        text("""
+            SELECT pg_relation_size(CAST(:table AS regclass)) AS table_bytes,
+                   pg_relation_size(CAST(:index AS regclass)) AS index_bytes,
+                   idx_blks_read, idx_blks_hit
+            FROM pg_statio_user_indexes WHERE indexrelname = :index
+        """),
+        {"table": table.name, "index": f"{table.name}_pkey"},
+    ).one()
+    return dict(row._mapping)
+
+# Inserts `rows` rows in batches with ids from `generate`; insert time and the final primary key
+# index size are what uuid4's random placement costs compared with time-ordered ids
+def run(engine, name: str, rows: int, batch_size: int) -> dict:
+    generate = GENERATORS[name]
+    metadata = MetaData()
+    table = _table(metadata, name)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    payload = os.urandom(32).hex()
+    try:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for offset in range(0, rows, batch_size):
+                conn.execute(
+                    table.insert(),
+                    [{"id": generate(), "payload": payload} for _ in range(min(batch_size, rows - offset))],
+                )
+        elapsed = time.perf_counter() - started
+        with engine.connect() as conn:
+            conn.execute(text(f"ANALYZE {table.name}"))
+            sizes = _sizes(conn, table)
+    finally:
+        metadata.drop_all(engine)
+    return {"ids": name, "rows": rows, "seconds": round(elapsed, 2), "rows_per_second": round(rows / elapsed), **sizes}
+
+# Usage: python -m benchmarks.uuid_keys --rows 2000000
+if __name__ == "__main__":
+    from db.engines import engines
+
+    parser = argparse.ArgumentParser(description="Compare insert throughput and primary key index size for uuid4 and uuid7 ids")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--ids", nargs="+", choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    args = parser.parse_args()
+
+    for name in args.ids:
+        print(json.dumps(run(engines.primary, name, args.rows, args.batch_size)))
@@ -6,13 +6,93 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api"
     DEBUG: bool = False
     DATABASE_URL: str = ''
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: str = ''
     ALLOWED_ORIGINS: str = ""
 
+    # Comma-separated read replica URLs; GET handlers read from these round-robin
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_RETRY_SECONDS: float = 30.0
+    # How long a client reads from the primary after writing, to see its own changes
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Production server (server.py). WEB_WORKERS=0 means one worker per available CPU core.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_WORKERS: int = 0
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+    SERVER_BACKLOG: int = 2048
+    # Requests beyond this many in flight per worker get a 503 instead of queueing; 0 disables the limit
+    SERVER_LIMIT_CONCURRENCY: int = 0
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # One log line per request; turn off only where the load balancer already keeps access logs
+    SERVER_ACCESS_LOG: bool = True
+
+    # Startup warm-up: connections opened per engine (capped at DB_POOL_SIZE) and hot paths requested
+    # in-process before the worker reports ready. In the background, the worker serves while warming up.
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 2
+    WARMUP_IN_BACKGROUND: bool = False
+
+    # Connection pool sizing, applied per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # A statement repeated this many times in one request, with different parameters, is logged as a probable N+1
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Shared directory where each worker process writes its metrics for /metrics to aggregate.
+    # Leave empty when running a single process; clear it when the whole service restarts.
+    METRICS_DIR: str = ""
+    METRICS_FLUSH_SECONDS: float = 1.0
+
+    # How often the in-memory birthday calendar checks the database for changes made by other processes
+    CALENDAR_REFRESH_SECONDS: float = 30.0
+
+    # Notification dispatch worker
+    NOTIFICATION_BATCH_SIZE: int = 100
+    NOTIFICATION_POLL_SECONDS: float = 5.0
+    NOTIFICATION_RETRY_SECONDS: float = 300.0
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    # Hour of day (UTC) at which fan-out campaigns are scheduled
+    NOTIFICATION_SEND_HOUR: int = 9
+    # How the dispatch worker delivers: "smtp" (SMTP_* below) or "log" (writes each message to the log,
+    # for development). The worker refuses to start without one.
+    NOTIFICATION_SENDER: str = ""
+    SMTP_HOST: str = ""
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_STARTTLS: bool = True
+    SMTP_FROM: str = ""
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+
+    # Outbox relay: batch size, idle poll interval, and exponential backoff before a message is marked dead
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_SECONDS: float = 5.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 3600.0
+
+    # In-memory autocomplete index: incremental refresh and full rebuild intervals
+    USER_SEARCH_REFRESH_SECONDS: float = 30.0
+    USER_SEARCH_REBUILD_SECONDS: float = 600.0
+    # How far back each refresh looks past the newest updated_at it has seen; should cover the longest
+    # write transaction (an HR import), since rows carry their transaction's start time
+    USER_SEARCH_OVERLAP_SECONDS: float = 300.0
+
     # Splitting the 2 values in the .env file and returning a string list
     @field_validator("ALLOWED_ORIGINS")
     def parse_allowed_origins(cls, v: str) -> List[str]:
         return v.split(',') if v else []
 
+    @field_validator("DATABASE_REPLICA_URLS")
+    def parse_replica_urls(cls, v: str) -> List[str]:
+        return [url.strip() for url in v.split(',') if url.strip()] if v else []
+
     # This is a configuration for loading the env variables correctly
     class Config:
         env_file = ".env"
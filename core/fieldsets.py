@@ -0,0 +1,37 @@
+from typing import Iterable, Optional, Set, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+# Parses a `fields=a,b,c` projection against the response schema. None means "all fields".
+def parse_fields(fields: Optional[str], schema: Type[BaseModel], always: Iterable[str] = ("id",)) -> Optional[Set[str]]:
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | set(always)
+
+def column_names(model, names: Iterable[str]):
+    columns = inspect(model).columns
+    return [name for name in names if name in columns]
+
+# Core column selection for list endpoints: only the requested columns cross the wire
+def select_columns(model, names: Iterable[str]):
+    return [getattr(model, name) for name in column_names(model, names)]
+
+# Loader option for ORM item endpoints; columns outside the fieldset are never fetched
+def load_only_option(model, names: Iterable[str]):
+    return load_only(*select_columns(model, names))
+
+# Builds the response from only the selected fields, so response_model_exclude_unset drops the rest
+def project(schema: Type[BaseModel], source, names: Optional[Set[str]]):
+    if names is None:
+        return schema.model_validate(source)
+    if hasattr(source, "_mapping"):
+        source = source._mapping
+    if hasattr(source, "keys"):
+        return schema.model_validate({name: source[name] for name in names if name in source})
+    return schema.model_validate({name: getattr(source, name) for name in names})
@@ -0,0 +1,58 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+
+# Cache-Control per kind of resource. Everything is private (per-user data) and
+# revalidated with ETag / Last-Modified once max-age runs out.
+CACHE_POLICIES = {
+    "directory": "private, max-age=0, must-revalidate",
+    "user": "private, max-age=30, must-revalidate",
+    "birthday": "private, max-age=30, must-revalidate",
+    "calendar": "private, max-age=300, must-revalidate",
+    "wishlist": "private, max-age=60, must-revalidate",
+}
+
+def make_etag(last_modified: Optional[datetime], *parts) -> str:
+    seed = "|".join([last_modified.isoformat() if last_modified else ""] + [str(part) for part in parts])
+    return 'W/"%s"' % hashlib.sha1(seed.encode()).hexdigest()
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+# Sets validators on the response and returns a 304 when the client's copy is still current.
+# Callers compute last_modified with a cheap max(updated_at) query before loading any payload.
+def conditional_response(
+    request: Request,
+    response: Response,
+    policy: str,
+    last_modified: Optional[datetime],
+    *etag_parts,
+) -> Optional[Response]:
+    etag = make_etag(last_modified, *etag_parts)
+    headers = {"ETag": etag, "Cache-Control": CACHE_POLICIES[policy]}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified))
+    return Response(status_code=304, headers=headers) if not_modified else None
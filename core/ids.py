@@ -0,0 +1,29 @@
+import os
+import threading
+import time
+import uuid
+
+# RFC 9562 UUIDv7: 48-bit Unix milliseconds, then 12 bits used as a per-millisecond counter and 62 random bits.
+# Ids created later sort later, so primary-key inserts land at the right edge of the B-tree instead of
+# on random pages.
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+def uuid7() -> uuid.UUID:
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF  # random start leaves room to count up
+        else:
+            # Same millisecond (or the clock went back): keep ordering by counting up, borrowing the next ms on overflow
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b)
+
@@ -0,0 +1,56 @@
+import importlib
+import threading
+from typing import List, NamedTuple, Tuple
+from core.startup import StartupProfile
+
+# A router module, the prefix it is included with, and the URL paths it serves (prefix included).
+# The paths are declared up front so a request can be matched to its module before it is imported.
+class LazyRouter(NamedTuple):
+    module: str
+    prefix: str
+    paths: Tuple[str, ...]
+
+    def serves(self, path: str) -> bool:
+        return any(path == root or path.startswith(root + "/") for root in self.paths)
+
+# Imports and includes each router the first time a request falls under its paths, so a worker starts
+# without loading every router, model and service. The OpenAPI schema needs all of them and loads the rest.
+class LazyRouters:
+    def __init__(self, app, routers: List[LazyRouter], profile: StartupProfile):
+        self._app = app
+        self._pending = list(routers)
+        self._profile = profile
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> List[str]:
+        return [router.module for router in self._pending]
+
+    def load_for_path(self, path: str):
+        for router in list(self._pending):
+            if router.serves(path):
+                self._load(router)
+
+    def load_all(self):
+        for router in list(self._pending):
+            self._load(router)
+
+    def _load(self, router: LazyRouter):
+        with self._lock:
+            if router not in self._pending:
+                return
+            with self._profile.timed("import", router.module):
+                module = importlib.import_module(router.module)
+            self._app.include_router(module.router, prefix=router.prefix)
+            self._app.openapi_schema = None
+            self._pending.remove(router)
+
+class LazyRouterMiddleware:
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.routers.pending:
+            self.routers.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
@@ -0,0 +1,216 @@
+import asyncio
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Tuple
+import anyio.to_thread
+from core.config import settings
+from db.pool import pool_metrics
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+METRICS = {
+    "http_requests_total": ("counter", "Total HTTP requests by route template, method and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by route template, method and status."),
+    "http_requests_in_flight": ("gauge", "HTTP requests currently being served."),
+    "db_pool_checkouts_total": ("counter", "Connections checked out of the pool."),
+    "db_pool_checkout_timeouts_total": ("counter", "Checkouts that timed out waiting for a connection."),
+    "db_pool_checkout_wait_seconds_total": ("counter", "Time spent waiting for a pooled connection."),
+    "db_pool_size": ("gauge", "Configured size of the connection pool."),
+    "db_pool_checked_out": ("gauge", "Connections currently checked out."),
+    "db_pool_overflow": ("gauge", "Overflow connections currently open beyond pool_size."),
+    "threadpool_busy_threads": ("gauge", "Worker threads busy running sync endpoints and dependencies."),
+    "threadpool_max_threads": ("gauge", "Capacity of the threadpool used for sync endpoints."),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Counters and histograms for this worker process. Gauges are sampled when a snapshot is taken.
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], list] = {}
+        self.in_flight = 0
+
+    def inc(self, name: str, labels: dict, value: float = 1.0):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: dict, value: float):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            # One slot per bucket plus +Inf, then sum and count
+            histogram = self.histograms.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0])
+            histogram[bisect_left(LATENCY_BUCKETS, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def _gauges(self, in_event_loop: bool) -> list:
+        gauges = [["http_requests_in_flight", {}, self.in_flight]]
+        for pool, data in pool_metrics.snapshot().items():
+            labels = {"pool": pool}
+            gauges += [
+                ["db_pool_size", labels, data.get("pool_size", 0)],
+                ["db_pool_checked_out", labels, data.get("checked_out", 0)],
+                ["db_pool_overflow", labels, data.get("overflow", 0)],
+            ]
+        if in_event_loop:
+            limiter = anyio.to_thread.current_default_thread_limiter()
+            gauges += [
+                ["threadpool_busy_threads", {}, limiter.borrowed_tokens],
+                ["threadpool_max_threads", {}, limiter.total_tokens],
+            ]
+        return gauges
+
+    def snapshot(self, in_event_loop: bool = True) -> dict:
+        counters = []
+        for pool, data in pool_metrics.snapshot().items():
+            labels = {"pool": pool}
+            counters += [
+                ["db_pool_checkouts_total", labels, data["checkouts"]],
+                ["db_pool_checkout_timeouts_total", labels, data["timeouts"]],
+                ["db_pool_checkout_wait_seconds_total", labels, data["wait_seconds_total"]],
+            ]
+        with self._lock:
+            counters += [[name, dict(labels), value] for (name, labels), value in self.counters.items()]
+            histograms = [[name, dict(labels), list(values)] for (name, labels), values in self.histograms.items()]
+        return {"pid": os.getpid(), "counters": counters, "histograms": histograms, "gauges": self._gauges(in_event_loop)}
+
+    # With several uvicorn workers each process writes its snapshot to METRICS_DIR; /metrics merges them all
+    def flush(self, in_event_loop: bool = True):
+        if not settings.METRICS_DIR:
+            return
+        path = os.path.join(settings.METRICS_DIR, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(in_event_loop), f)
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+atexit.register(lambda: registry.flush(in_event_loop=False))
+
+# Started by the app's lifespan in every worker. Snapshots are rewritten on a timer rather than when
+# requests finish, so another worker's gauges are at most METRICS_FLUSH_SECONDS old on a scrape, also
+# while it is idle or still serving a long request.
+async def flush_periodically():
+    while True:
+        try:
+            registry.flush()
+        except OSError:
+            logger.exception("Could not write metrics snapshot to %s", settings.METRICS_DIR)
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def collect_snapshots() -> list:
+    if not settings.METRICS_DIR:
+        return [registry.snapshot()]
+    registry.flush()
+    snapshots = []
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, "metrics-*.json")):
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items())) + "}"
+
+# Counters and histograms are summed across workers (exited workers keep contributing their totals);
+# gauges are reported per live worker with a pid label.
+def render(snapshots: list) -> str:
+    counters, histograms, gauges = {}, {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(sorted(labels.items())))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, values in snapshot["histograms"]:
+            key = (name, tuple(sorted(labels.items())))
+            merged = histograms.setdefault(key, [0] * len(values))
+            histograms[key] = [a + b for a, b in zip(merged, values)]
+        if len(snapshots) == 1 or _pid_alive(snapshot["pid"]):
+            for name, labels, value in snapshot["gauges"]:
+                key = (name, tuple(sorted({**labels, "pid": str(snapshot["pid"])}.items())))
+                gauges[key] = value
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "histogram":
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                labels = dict(labels)
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), values[:-2]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels({**labels, 'le': str(bound)})} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {values[-2]}")
+                lines.append(f"{name}_count{_format_labels(labels)} {values[-1]}")
+        else:
+            source = counters if kind == "counter" else gauges
+            for (metric, labels), value in sorted(source.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(dict(labels))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# Cleared while the startup warm-up replays hot requests in-process, so they don't count as traffic
+recording: ContextVar[bool] = ContextVar("metrics_recording", default=True)
+
+# Records request count, latency and in-flight requests under the matched route template
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not recording.get():
+            return await self.app(scope, receive, send)
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            route = scope.get("route")
+            labels = {
+                "route": getattr(route, "path", "unmatched"),
+                "method": scope["method"],
+                "status": str(status),
+            }
+            registry.inc("http_requests_total", labels)
+            registry.observe("http_request_duration_seconds", labels, time.perf_counter() - start)
@@ -0,0 +1,18 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from fastapi import HTTPException
+
+# Cursors are opaque to clients: urlsafe base64 of the last row's (created_at, id)
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,43 @@
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Where a worker's cold start goes: each router import (including the models and services it pulls in
+# for the first time) and each lifespan hook. For a finer breakdown of a slow import, run
+# python -X importtime -c "import main; main.create_app()".
+class StartupProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.ready_after = None
+        self.timings = []
+
+    @contextmanager
+    def timed(self, phase: str, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append({"phase": phase, "name": name, "seconds": round(time.perf_counter() - start, 6)})
+
+    def mark_ready(self):
+        self.ready_after = round(time.perf_counter() - self.started, 6)
+
+    def report(self) -> dict:
+        return {"ready_after_seconds": self.ready_after, "timings": self.timings}
+
+    def log(self):
+        logger.info("Startup finished in %.3fs", self.ready_after or 0.0)
+        for timing in sorted(self.timings, key=lambda item: item["seconds"], reverse=True):
+            logger.info("  %-8s %-40s %.3fs", timing["phase"], timing["name"], timing["seconds"])
+
+# Hooks take the app and may be sync or async; each one is timed under `phase`
+async def run_hooks(profile: StartupProfile, phase: str, hooks: Iterable[Callable], app):
+    for hook in hooks:
+        with profile.timed(phase, hook.__name__):
+            result = hook(app)
+            if inspect.isawaitable(result):
+                await result
@@ -1,23 +1,94 @@
-from sqlalchemy import create_engine
+from sqlalchemy import event, DDL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from fastapi import Request
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from core.config import settings
+from db.engines import engines
+from db.lifecycle import track_session
+from db.pool import pool_metrics
+from db.routing import RoutingSession, wants_primary
 
-engine = create_engine(
-    settings.DATABASE_URL,
-)
+# Sessions bind to this process's engines when they are opened, not when this module is imported
+class _RegistrySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            local_kw.setdefault("bind", engines.primary)
+        if "replicas" not in self.kw:
+            local_kw.setdefault("replicas", engines.replicas)
+        return super().__call__(**local_kw)
+
+SessionLocal = _RegistrySessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async sessions for handlers that opt into running on the event loop instead of the threadpool.
+# Objects stay usable after commit, since lazy refreshes can't happen implicitly under asyncio.
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False,
+)
 
 # All models inherit from this Base Class
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+# Extensions the model indexes rely on
+PG_TRGM_EXTENSION = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+event.listen(Base.metadata, "before_create", PG_TRGM_EXTENSION.execute_if(dialect="postgresql"))
+
+# Server-side counterpart of core.ids.uuid7 for rows created by INSERT ... SELECT: a random v4 uuid
+# with the first 48 bits replaced by Unix milliseconds and the version bits switched to 7
+UUID_V7_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(set_bit(
+            overlay(uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6),
+            52, 1), 53, 1),
+        'hex')::uuid
+$$ LANGUAGE sql VOLATILE
+""")
+event.listen(Base.metadata, "before_create", UUID_V7_FUNCTION.execute_if(dialect="postgresql"))
+
+# Sessions handed to API handlers raise on lazy loads (see db.loaders for the eager-loading profiles)
+API_SESSION_INFO = {"raise_on_lazy_load": True}
+
+# Writes, and reads that must see them, always go to the primary
+def get_db(request: Request):
+    db = SessionLocal(info=dict(API_SESSION_INFO))
+    track_session(request, db)
     try:
         yield db
     finally:
         db.close()
 
+# For GET handlers: reads are served by a replica unless the client recently wrote
+def get_read_db(request: Request):
+    db = SessionLocal(info=dict(API_SESSION_INFO), use_replica=not wants_primary(request))
+    track_session(request, db)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal(bind=engines.async_primary, replicas=engines.async_replicas, info=dict(API_SESSION_INFO)) as db:
+        track_session(request, db)
+        yield db
+
+async def get_async_read_db(request: Request):
+    async with AsyncSessionLocal(
+        bind=engines.async_primary, replicas=engines.async_replicas, info=dict(API_SESSION_INFO),
+        use_replica=not wants_primary(request),
+    ) as db:
+        track_session(request, db)
+        yield db
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engines.primary)
+
+# create_all installs these on a fresh database; an existing one gets them from db.schema.upgrade_schema
+def install_sql_functions(bind=None):
+    with (bind or engines.primary).begin() as connection:
+        connection.execute(PG_TRGM_EXTENSION)
+        connection.execute(UUID_V7_FUNCTION)
+
+def get_pool_metrics() -> dict:
+    return pool_metrics.snapshot()
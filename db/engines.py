@@ -0,0 +1,115 @@
+import os
+import threading
+from typing import List, Optional
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from core.config import settings
+from db.instrumentation import instrument_engine
+from db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_metrics
+from db.routing import ReplicaSet
+
+def _pool_options() -> dict:
+    return dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+# Every engine gets the pool instrumentation and per-request query counting
+def _create_engine(url: str, name: str) -> Engine:
+    return instrument_engine(
+        create_engine(url, poolclass=InstrumentedQueuePool, pool_logging_name=name, **_pool_options())
+    )
+
+# Same database, reached through the asyncpg driver
+def _async_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+def get_async_database_url() -> str:
+    return settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL)
+
+def _create_async_engine(url: str, name: str) -> AsyncEngine:
+    async_engine = create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, pool_logging_name=name, **_pool_options())
+    instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+# The one place engines are created. Nothing connects at import time: each engine is built on first use,
+# so a pre-forking server's master never opens sockets its workers would inherit. If the process forks
+# after all, the child drops its inherited pools without closing them (the parent still owns those
+# sockets) and opens its own connections on demand.
+class EngineRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._primary: Optional[Engine] = None
+        self._replicas: Optional[ReplicaSet] = None
+        self._async_primary: Optional[AsyncEngine] = None
+        self._async_replicas: Optional[ReplicaSet] = None
+        self._async_replica_engines: List[AsyncEngine] = []
+
+    @property
+    def primary(self) -> Engine:
+        if self._primary is None:
+            with self._lock:
+                if self._primary is None:
+                    self._primary = _create_engine(settings.DATABASE_URL, "primary")
+        return self._primary
+
+    @property
+    def replicas(self) -> ReplicaSet:
+        if self._replicas is None:
+            with self._lock:
+                if self._replicas is None:
+                    self._replicas = ReplicaSet([
+                        _create_engine(url, f"replica-{i}") for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+                    ])
+        return self._replicas
+
+    # Async engines are only created by the async handlers, so CLIs and workers don't need asyncpg installed
+    @property
+    def async_primary(self) -> AsyncEngine:
+        if self._async_primary is None:
+            with self._lock:
+                if self._async_primary is None:
+                    self._async_primary = _create_async_engine(get_async_database_url(), "async")
+        return self._async_primary
+
+    @property
+    def async_replicas(self) -> ReplicaSet:
+        if self._async_replicas is None:
+            with self._lock:
+                if self._async_replicas is None:
+                    self._async_replica_engines = [
+                        _create_async_engine(_async_url(url), f"async-replica-{i}")
+                        for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+                    ]
+                    self._async_replicas = ReplicaSet([engine.sync_engine for engine in self._async_replica_engines])
+        return self._async_replicas
+
+    def _sync_engines(self) -> list:
+        return ([self._primary] if self._primary else []) + (self._replicas.engines if self._replicas else [])
+
+    def _async_engines(self) -> list:
+        return ([self._async_primary] if self._async_primary else []) + self._async_replica_engines
+
+    def after_fork_in_child(self):
+        self._lock = threading.Lock()
+        pool_metrics.clear()
+        for engine in self._sync_engines() + [engine.sync_engine for engine in self._async_engines()]:
+            engine.dispose(close=False)
+
+    # Closes every pooled connection; called from the app's lifespan on shutdown
+    async def dispose(self):
+        for engine in self._sync_engines():
+            engine.dispose()
+        for engine in self._async_engines():
+            await engine.dispose()
+
+
+engines = EngineRegistry()
+
+# Linux/macOS; covers gunicorn --preload and anything else that forks after an engine was used
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=engines.after_fork_in_child)
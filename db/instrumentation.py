@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statements run and time spent in the database for one request (or one query_budget block)
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._executions = defaultdict(int)
+        self._parameters = defaultdict(set)
+
+    def record(self, statement: str, parameters, duration: float):
+        self.count += 1
+        self.duration += duration
+        self._executions[statement] += 1
+        self._parameters[statement].add(repr(parameters))
+
+    def merge(self, other: "QueryStats"):
+        self.count += other.count
+        self.duration += other.duration
+        for statement, executions in other._executions.items():
+            self._executions[statement] += executions
+            self._parameters[statement] |= other._parameters[statement]
+
+    # The same statement run many times with different parameters is almost always a lazy load in a loop
+    def n_plus_one_suspects(self, threshold: Optional[int] = None) -> dict:
+        threshold = threshold or settings.QUERY_N_PLUS_ONE_THRESHOLD
+        return {
+            statement: executions
+            for statement, executions in self._executions.items()
+            if executions >= threshold and len(self._parameters[statement]) > 1
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None and conn.info.get("query_start"):
+        stats.record(statement, parameters, time.perf_counter() - conn.info["query_start"].pop())
+
+def instrument_engine(engine: Engine) -> Engine:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+_budgets_lock = threading.Lock()
+_active_budgets = []
+
+# For tests: fails if the wrapped code, including requests made through a TestClient, runs more than
+# max_queries statements or (unless allowed) repeats a statement enough to look like an N+1.
+#
+#     with query_budget(3):
+#         client.get(f"/api/birthdays/{birthday_id}")
+@contextmanager
+def query_budget(max_queries: int, allow_n_plus_one: bool = False):
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    with _budgets_lock:
+        _active_budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        with _budgets_lock:
+            _active_budgets.remove(stats)
+
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(f"{stats.count} queries run, budget was {max_queries}")
+    suspects = stats.n_plus_one_suspects()
+    if suspects and not allow_n_plus_one:
+        statement, executions = next(iter(suspects.items()))
+        raise QueryBudgetExceeded(f"Probable N+1: statement ran {executions} times: {statement}")
+
+
+# Collects per-request query stats, logs probable N+1 patterns and, in DEBUG, reports
+# the database share of the response time in a Server-Timing header
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", stats.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            for statement, executions in stats.n_plus_one_suspects().items():
+                logger.warning("Probable N+1 on %s %s: ran %d times: %s", scope["method"], scope["path"], executions, statement)
+            with _budgets_lock:
+                for budget in _active_budgets:
+                    budget.merge(stats)
@@ -0,0 +1,34 @@
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Sessions only check out a connection on their first statement and give it back when their
+# transaction commits or rolls back. Request-scoped sessions are registered here so a read-only
+# handler's open transaction is ended as soon as the endpoint has produced its response,
+# rather than when the dependency teardown runs after the body has been sent.
+def track_session(request: Request, db):
+    sessions = getattr(request.state, "db_sessions", None)
+    if sessions is None:
+        sessions = request.state.db_sessions = []
+    sessions.append(db)
+
+async def release_sessions(request: Request):
+    for db in getattr(request.state, "db_sessions", ()):
+        if isinstance(db, AsyncSession):
+            await db.close()
+        elif db.in_transaction():
+            await run_in_threadpool(db.close)
+    request.state.db_sessions = []
+
+class ReleaseSessionRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def release_after_handler(request: Request):
+            try:
+                return await handler(request)
+            finally:
+                await release_sessions(request)
+
+        return release_after_handler
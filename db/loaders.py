@@ -0,0 +1,53 @@
+from typing import Iterable, Optional
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload, undefer
+from models import Birthday, Contribution, Notification, Organizer, User, Wishlist
+
+USER_SUMMARY_COLUMNS = (User.id, User.email, User.first_name, User.last_name)
+
+# A named set of loader options. Relationships are keyed by attribute name so endpoints with
+# sparse fieldsets can apply only the ones they return; every profile ends in raiseload("*").
+class LoaderProfile:
+    def __init__(self, *column_options, **relationships):
+        self.column_options = column_options
+        self.relationships = relationships
+
+    def options(self, only: Optional[Iterable[str]] = None) -> list:
+        names = self.relationships if only is None else [name for name in only if name in self.relationships]
+        return [*self.column_options, *(self.relationships[name] for name in names), raiseload("*")]
+
+def _user_summary(loader):
+    return loader.load_only(*USER_SUMMARY_COLUMNS).raiseload("*")
+
+LOADER_PROFILES = {
+    "user_summary": LoaderProfile(load_only(*USER_SUMMARY_COLUMNS)),
+    "user_detail": LoaderProfile(
+        wishlists=selectinload(User.wishlists).raiseload("*"),
+        birthdays=selectinload(User.birthdays).raiseload("*"),
+    ),
+    "birthday_calendar": LoaderProfile(user=_user_summary(joinedload(Birthday.user))),
+    "birthday_detail": LoaderProfile(
+        user=_user_summary(joinedload(Birthday.user)),
+        organizer=joinedload(Birthday.organizer).options(undefer(Organizer.gift_description), raiseload("*")),
+        contributions=selectinload(Birthday.contributions).options(
+            _user_summary(joinedload(Contribution.contributor)), raiseload("*"),
+        ),
+    ),
+    "organizer_detail": LoaderProfile(
+        undefer(Organizer.gift_description),
+        organizer=_user_summary(joinedload(Organizer.organizer)),
+        birthday=joinedload(Organizer.birthday).raiseload("*"),
+        contributions=selectinload(Organizer.contributions).options(
+            _user_summary(joinedload(Contribution.contributor)), raiseload("*"),
+        ),
+    ),
+    "contribution_list": LoaderProfile(contributor=_user_summary(joinedload(Contribution.contributor))),
+    # selectin, not joined: the dispatcher claims notifications FOR UPDATE, which can't cover outer joins
+    "notification_delivery": LoaderProfile(
+        user=_user_summary(selectinload(Notification.user)),
+        birthday=selectinload(Notification.birthday).options(_user_summary(joinedload(Birthday.user)), raiseload("*")),
+    ),
+    "wishlist_detail": LoaderProfile(undefer(Wishlist.description), user=_user_summary(joinedload(Wishlist.user))),
+}
+
+def loader_options(profile: str, only: Optional[Iterable[str]] = None) -> list:
+    return LOADER_PROFILES[profile].options(only)
@@ -0,0 +1,115 @@
+import threading
+import time
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Per-pool counters describing how requests wait on a connection pool
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.releases = 0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    # Time between checkout and checkin, i.e. how long a request kept the connection
+    def observe_hold(self, seconds: float):
+        with self._lock:
+            self.releases += 1
+            self.hold_seconds_total += seconds
+            self.hold_seconds_max = max(self.hold_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "hold_seconds_total": round(self.hold_seconds_total, 6),
+                "hold_seconds_max": round(self.hold_seconds_max, 6),
+                "hold_seconds_avg": round(self.hold_seconds_total / self.releases, 6) if self.releases else 0.0,
+            }
+        pool = self.pool
+        if pool is not None:
+            data.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # QueuePool reports overflow as negative while the base pool is not yet full
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        return data
+
+# Metrics keyed by the engine's pool_logging_name, so they survive pool.recreate() on dispose
+class PoolMetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, pool) -> PoolMetrics:
+        name = getattr(pool, "logging_name", None) or "primary"
+        with self._lock:
+            metrics = self._metrics.setdefault(name, PoolMetrics())
+        metrics.pool = pool
+        return metrics
+
+    # A forked worker starts counting from zero instead of reporting its parent's history
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = list(self._metrics.items())
+        return {name: metrics.snapshot() for name, metrics in items}
+
+
+pool_metrics = PoolMetricsRegistry()
+
+
+# Records how long each checkout waited for a free connection and how long it was held
+class _InstrumentedPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = pool_metrics.register(self)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        now = time.perf_counter()
+        self.metrics.observe_wait(now - start)
+        conn.info["checked_out_at"] = now
+        return conn
+
+    def _do_return_conn(self, record):
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.metrics.observe_hold(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,118 @@
+import itertools
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, raiseload
+from core.config import settings
+
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "x-read-primary"
+
+# Round-robin over the replica engines. A replica that raises a connection error is skipped
+# for REPLICA_RETRY_SECONDS, after which it is tried again; with none available reads go to the primary.
+class ReplicaSet:
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self._cycle = itertools.cycle(range(len(engines))) if engines else None
+        self._lock = threading.Lock()
+        self._down_until = {}
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, engine: Engine):
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+
+    def choose(self) -> Optional[Engine]:
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[next(self._cycle)]
+                if self._down_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def status(self) -> list:
+        now = time.monotonic()
+        return [
+            {"url": engine.url.render_as_string(hide_password=True), "healthy": self._down_until.get(engine, 0) <= now}
+            for engine in self.engines
+        ]
+
+_UNCHOSEN = object()
+
+# Sends reads to a replica when the session was opened for a read-only request, and everything
+# else (DML, flushes, anything after the session has written) to the primary bind.
+# The replica is picked once, on the first read, and kept until the session closes, so every
+# query in a request (e.g. an ETag check and the body it validates) sees the same replication lag.
+class RoutingSession(Session):
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, use_replica: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.use_replica = use_replica
+        self._replica = _UNCHOSEN
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.use_replica
+            and self.replicas is not None
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not getattr(clause, "is_dml", False)
+        ):
+            if self._replica is _UNCHOSEN:
+                self._replica = self.replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def close(self):
+        super().close()
+        self._replica = _UNCHOSEN
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_primary(session, flush_context):
+    session.info["wrote"] = True
+
+@event.listens_for(RoutingSession, "after_commit")
+def _unpin(session):
+    session.info.pop("wrote", None)
+
+# API sessions are opened with info["raise_on_lazy_load"]; any relationship a query did not
+# load explicitly raises on access instead of silently issuing one query per row
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _raise_on_lazy_load(orm_execute_state):
+    if (
+        orm_execute_state.session.info.get("raise_on_lazy_load")
+        and orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+# Clients that just wrote read from the primary for a few seconds, so they see their own changes
+def wants_primary(request) -> bool:
+    return READ_PRIMARY_HEADER in request.headers or READ_PRIMARY_COOKIE in request.cookies
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS") or not settings.DATABASE_REPLICA_URLS:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = f"{READ_PRIMARY_COOKIE}=1; Max-Age={settings.READ_YOUR_WRITES_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,61 @@
+import json
+from sqlalchemy import UniqueConstraint, inspect, text
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex
+from db.database import Base, install_sql_functions
+from db.engines import engines
+
+# create_all only creates missing tables, so a database created before these models changed never gets
+# their new columns, indexes and constraints. upgrade_schema brings it up to date; every step is a no-op
+# when already applied, so it is safe to run on every deploy.
+
+# Columns whose nullability or default changed on a table that already existed
+DATA_FIXES = (
+    "UPDATE notifications SET scheduled_at = coalesce(created_at, now()) WHERE scheduled_at IS NULL",
+    "ALTER TABLE notifications ALTER COLUMN scheduled_at SET DEFAULT now(), ALTER COLUMN scheduled_at SET NOT NULL",
+    "UPDATE notifications SET is_sent = false WHERE is_sent IS NULL",
+    "ALTER TABLE notifications ALTER COLUMN is_sent SET DEFAULT false, ALTER COLUMN is_sent SET NOT NULL",
+    "UPDATE users SET created_at = now() WHERE created_at IS NULL",
+    "ALTER TABLE users ALTER COLUMN created_at SET NOT NULL",
+)
+
+def _add_missing_columns(connection, table):
+    quoted = connection.dialect.identifier_preparer.format_table(table)
+    for column in table.columns:
+        ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.execute(text(f"ALTER TABLE {quoted} ADD COLUMN IF NOT EXISTS {ddl}"))
+
+def _add_missing_constraints(connection, table):
+    existing = {constraint["name"] for constraint in inspect(connection).get_unique_constraints(table.name)}
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.name and constraint.name not in existing:
+            connection.execute(AddConstraint(constraint))
+
+def upgrade_schema(bind=None) -> dict:
+    import models  # noqa: F401 - registers every table on Base.metadata
+    from db.database import SessionLocal
+    from services.contributions import reconcile_totals
+
+    bind = bind or engines.primary
+    install_sql_functions(bind)
+    with bind.begin() as connection:
+        existing = set(inspect(connection).get_table_names())
+        Base.metadata.create_all(connection)
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing:
+                continue
+            _add_missing_columns(connection, table)
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+            _add_missing_constraints(connection, table)
+        for statement in DATA_FIXES:
+            connection.execute(text(statement))
+
+    # Birthdays that had contributions before the totals columns existed start at 0
+    with SessionLocal(bind=bind) as db:
+        backfilled = reconcile_totals(db, fix=True)
+    return {"created_tables": sorted(set(Base.metadata.tables) - existing), "backfilled_totals": len(backfilled)}
+
+# Usage: python -m db.schema
+# Run once against an existing database before deploying this release, and after later model changes
+if __name__ == "__main__":
+    print(json.dumps(upgrade_schema()))
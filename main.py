@@ -1,25 +1,130 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.config import settings
+from core.lazy_routers import LazyRouter, LazyRouterMiddleware, LazyRouters
+from core.metrics import MetricsMiddleware, flush_periodically, registry
+from core.startup import StartupProfile, run_hooks
+from db.engines import engines
+from db.instrumentation import QueryStatsMiddleware
+from db.routing import ReadYourWritesMiddleware
 
-app = FastAPI(
-    title="Symphony Birthday Planner",
-    description="Internal symphony.is application for managing birthdays",
-    version='0.1.0',
-    docs_url='/docs',
-    redoc_url='/redoc',
-)
-
-# Basically an allowance to make calls to the backend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.ALLOWED_ORIGINS,
-    allow_credentials=True,
-    allow_methods=['*'],
-    allow_headers=['*'],
-)
+API = settings.API_PREFIX
+
+# Router modules, their prefixes and the paths they serve. Each is imported on the first request
+# under its paths (or when the OpenAPI schema is built), and the import is timed in the startup report.
+# A new router, or a router that gains a new top-level path, must be listed here.
+ROUTERS = [
+    LazyRouter("routers.metrics", "", ("/metrics",)),
+    LazyRouter("routers.health", API, (f"{API}/health",)),
+    LazyRouter("routers.users", API, (f"{API}/users",)),
+    LazyRouter("routers.birthdays", API, (f"{API}/birthdays",)),
+    LazyRouter("routers.contributions", API, (f"{API}/birthdays", f"{API}/contributions")),
+    LazyRouter("routers.wishlists", API, (f"{API}/users", f"{API}/wishlists")),
+    LazyRouter("routers.notifications", API, (f"{API}/notifications",)),
+    LazyRouter("routers.exports", API, (f"{API}/exports",)),
+]
+
+# With METRICS_DIR set, each worker keeps its snapshot there current for /metrics in any worker to merge
+async def start_metrics_flush(app: FastAPI):
+    if settings.METRICS_DIR:
+        app.state.metrics_task = asyncio.create_task(flush_periodically())
+
+# Opens pool connections, runs the hot read paths once and primes in-process caches before
+# /health/ready reports the worker ready (see services.warmup)
+async def warm_up(app: FastAPI):
+    if not settings.WARMUP_ENABLED:
+        app.state.ready = True
+        return
+    from services.warmup import warm_up as run_warm_up
+
+    async def run():
+        await run_warm_up(app, app.state.startup_profile)
+        app.state.ready = True
+
+    if settings.WARMUP_IN_BACKGROUND:
+        app.state.warmup_task = asyncio.create_task(run())
+    else:
+        await run()
+
+# Load balancers stop routing to the worker before its connections go away
+async def mark_not_ready(app: FastAPI):
+    app.state.ready = False
+    task = getattr(app.state, "warmup_task", None)
+    if task is not None and not task.done():
+        task.cancel()
+
+async def stop_metrics_flush(app: FastAPI):
+    task = getattr(app.state, "metrics_task", None)
+    if task is not None:
+        task.cancel()
+        registry.flush()
+
+# Each worker opens its own connections on first use and closes them all when it shuts down
+async def dispose_engines(app: FastAPI):
+    await engines.dispose()
+
+# Run in order by the lifespan; each hook takes the app and may be sync or async
+STARTUP_HOOKS = [start_metrics_flush, warm_up]
+SHUTDOWN_HOOKS = [mark_not_ready, stop_metrics_flush, dispose_engines]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    profile = app.state.startup_profile
+    await run_hooks(profile, "startup", STARTUP_HOOKS, app)
+    profile.mark_ready()
+    profile.log()
+    yield
+    await run_hooks(profile, "shutdown", SHUTDOWN_HOOKS, app)
+
+def create_app() -> FastAPI:
+    profile = StartupProfile()
+    app = FastAPI(
+        title="Symphony Birthday Planner",
+        description="Internal symphony.is application for managing birthdays",
+        version='0.1.0',
+        docs_url='/docs',
+        redoc_url='/redoc',
+        lifespan=lifespan,
+    )
+    app.state.startup_profile = profile
+    app.state.ready = False
+
+    # Innermost, so the first request's router import counts towards its measured latency
+    routers = LazyRouters(app, ROUTERS, profile)
+    app.add_middleware(LazyRouterMiddleware, routers=routers)
+
+    # Basically an allowance to make calls to the backend
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=['*'],
+        allow_headers=['*'],
+    )
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    app.add_middleware(MetricsMiddleware)
+
+    build_openapi = app.openapi
+
+    def openapi():
+        routers.load_all()
+        return build_openapi()
+
+    app.openapi = openapi
+    app.state.routers = routers
+    return app
+
+# `main:app` still works (uvicorn main:app, tests): the app is built on first access
+def __getattr__(name):
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # This allows to serve the fastAPI application, uvicorn is a web-server
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,8 @@
+# Importing every model here registers them all on Base, so string-based relationships resolve
+from models.users import User
+from models.birthday import Birthday
+from models.contribution import Contribution
+from models.notification import Notification
+from models.organizer import Organizer
+from models.wishlist import Wishlist
+from models.outbox import OutboxMessage
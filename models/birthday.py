@@ -1,20 +1,27 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Date
+from sqlalchemy import Column, String, DateTime, ForeignKey, Date, Index, Integer, Numeric, extract
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from core.ids import uuid7
 from db.database import Base
-import uuid
 
 class Birthday(Base):
     __tablename__ = "birthdays"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), unique=True, nullable=False)
     date = Column(Date, nullable=False)
     status = Column(String, default="planned")  # planned | collecting | gift_decided | completed | cancelled
+    # Contribution aggregates, kept in step by services.contributions in the same transaction
+    pledged_total = Column(Numeric(12, 2), default=0, server_default="0", nullable=False)
+    paid_total = Column(Numeric(12, 2), default=0, server_default="0", nullable=False)
+    contributor_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
+    # Calendar windows filter on (month, day) regardless of birth year
+    __table_args__ = (Index("ix_birthdays_month_day", extract("month", date), extract("day", date)),)
+
     # Relationships
     user = relationship("User", back_populates="birthdays")
     organizer = relationship("Organizer", back_populates="birthday", uselist=False, cascade="all, delete-orphan")
@@ -1,24 +1,76 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, Boolean, UniqueConstraint
+from decimal import Decimal
+from sqlalchemy import Column, DateTime, ForeignKey, Numeric, Boolean, UniqueConstraint, event, inspect, update
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from core.ids import uuid7
 from db.database import Base
-import uuid
+from models.birthday import Birthday
 
 class Contribution(Base):
     __tablename__ = "contributions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     birthday_id = Column(UUID(as_uuid=True), ForeignKey("birthdays.id", ondelete="CASCADE"), nullable=False)
     contributor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     organizer_id = Column(UUID(as_uuid=True), ForeignKey("organizers.id", ondelete="SET NULL"), nullable=True)
     amount = Column(Numeric(12, 2), nullable=False)
     paid = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
     __table_args__ = (UniqueConstraint("birthday_id", "contributor_id", name="uq_contribution_unique"),)
 
     # Relationships
     birthday = relationship("Birthday", back_populates="contributions")
     contributor = relationship("User", back_populates="contributions")
-    organizer = relationship("Organizer", back_populates="contributions")
\ No newline at end of file
+    organizer = relationship("Organizer", back_populates="contributions")
+
+# Birthday.pledged_total/paid_total/contributor_count are maintained here, next to the model, so every
+# code path that flushes a Contribution (API, CLIs, scripts) keeps them in step
+ZERO = Decimal("0")
+
+# Relative increments, so concurrent contributions to the same birthday never overwrite each other's totals
+def apply_deltas(connection, deltas: dict):
+    for birthday_id, (pledged, paid, count) in deltas.items():
+        if pledged or paid or count:
+            connection.execute(
+                update(Birthday)
+                .where(Birthday.id == birthday_id)
+                .values(
+                    pledged_total=Birthday.pledged_total + pledged,
+                    paid_total=Birthday.paid_total + paid,
+                    contributor_count=Birthday.contributor_count + count,
+                )
+            )
+
+# (pledged, paid, count) change a contribution makes to its birthday's totals when added (+1) or removed (-1)
+def contribution_delta(amount, paid, sign: int) -> tuple:
+    amount = Decimal(amount or 0) * sign
+    return amount, amount if paid else ZERO, sign
+
+def add_delta(deltas: dict, birthday_id, delta: tuple):
+    current = deltas.get(birthday_id, (ZERO, ZERO, 0))
+    deltas[birthday_id] = tuple(a + b for a, b in zip(current, delta))
+
+# Mapper events run inside the flush, on the flush's connection, so totals commit or roll back with the contribution
+@event.listens_for(Contribution, "after_insert")
+def _contribution_inserted(mapper, connection, target):
+    apply_deltas(connection, {target.birthday_id: contribution_delta(target.amount, target.paid, 1)})
+
+@event.listens_for(Contribution, "after_delete")
+def _contribution_deleted(mapper, connection, target):
+    apply_deltas(connection, {target.birthday_id: contribution_delta(target.amount, target.paid, -1)})
+
+@event.listens_for(Contribution, "after_update")
+def _contribution_updated(mapper, connection, target):
+    state = inspect(target)
+
+    def before(name):
+        history = state.attrs[name].history
+        return history.deleted[0] if history.deleted else getattr(target, name)
+
+    deltas = {}
+    add_delta(deltas, before("birthday_id"), contribution_delta(before("amount"), before("paid"), -1))
+    add_delta(deltas, target.birthday_id, contribution_delta(target.amount, target.paid, 1))
+    apply_deltas(connection, deltas)
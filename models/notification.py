@@ -1,22 +1,33 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Boolean, String
+from sqlalchemy import Column, DateTime, ForeignKey, Boolean, Integer, String, Text, Index, UniqueConstraint, false
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
+from core.ids import uuid7
 from db.database import Base
-import uuid
 
 class Notification(Base):
     __tablename__ = "notifications"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     type = Column(String, nullable=False)  # monthly_reminder | gift_invite | payment_request | birthday_wish
     birthday_id = Column(UUID(as_uuid=True), ForeignKey("birthdays.id", ondelete="SET NULL"), nullable=True)
-    scheduled_at = Column(DateTime(timezone=True), nullable=True)
+    scheduled_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     sent_at = Column(DateTime(timezone=True), nullable=True)
-    is_sent = Column(Boolean, default=False)
+    is_sent = Column(Boolean, default=False, server_default=false(), nullable=False)
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    failed_at = Column(DateTime(timezone=True), nullable=True)  # set once NOTIFICATION_MAX_ATTEMPTS deliveries failed
+    last_error = Column(Text, nullable=True)
+    campaign = Column(String, nullable=True)  # set by fan-out jobs, e.g. monthly_reminder:2026-11
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Only pending rows are indexed, so the dispatcher's "due and unsent" scan stays small as history grows
+        Index("ix_notifications_due", "scheduled_at", postgresql_where=(is_sent == false()) & failed_at.is_(None)),
+        # Re-running a fan-out campaign never creates a second notification for the same user
+        UniqueConstraint("user_id", "type", "campaign", name="uq_notification_campaign"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="notifications")
     birthday = relationship("Birthday", back_populates="notifications")
\ No newline at end of file
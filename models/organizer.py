@@ -1,17 +1,17 @@
 from sqlalchemy import Column, DateTime, ForeignKey, Numeric, UniqueConstraint, Text
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from core.ids import uuid7
 from db.database import Base
-import uuid
 
 class Organizer(Base):
     __tablename__ = "organizers"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     birthday_id = Column(UUID(as_uuid=True), ForeignKey("birthdays.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    gift_description = Column(Text, nullable=True)
+    gift_description = deferred(Column(Text, nullable=True))
     total_amount = Column(Numeric(12, 2), default=3000)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
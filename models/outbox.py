@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, text
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from core.ids import uuid7
+from db.database import Base
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    topic = Column(String, nullable=False)  # e.g. birthday.collecting
+    payload = Column(JSONB, nullable=False)
+    status = Column(String, default="pending", server_default="pending", nullable=False)  # pending | sent | dead
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    # The relay only ever scans pending rows, so delivered history does not slow it down
+    __table_args__ = (
+        Index("ix_outbox_pending", "available_at", postgresql_where=text("status = 'pending'")),
+    )
@@ -1,22 +1,34 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.dialects.postgresql import UUID, JSONB
+from core.ids import uuid7
 from db.database import Base
-import uuid
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String, unique=True, nullable=False)
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     role = Column(String, default="user") # Future improvement: admin
-    bank_details = Column(JSONB, nullable=True)  # encrypted at rest
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    bank_details = deferred(Column(JSONB, nullable=True))  # encrypted at rest, only loaded on demand
+    import_hash = Column(String(64), nullable=True)  # sha256 of the last HR import row, used to skip unchanged rows
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
+    __table_args__ = (
+        # Backs keyset pagination of the user directory
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Fuzzy people-picker search, needs the pg_trgm extension
+        Index(
+            "ix_users_search_trgm", "first_name", "last_name", "email",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops", "last_name": "gin_trgm_ops", "email": "gin_trgm_ops"},
+        ),
+    )
+
     # Relationships
     wishlists = relationship("Wishlist", back_populates="user", cascade="all, delete-orphan")
     birthdays = relationship("Birthday", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,121 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+from core.fieldsets import load_only_option, parse_fields, project
+from core.http_cache import conditional_response
+from db.database import get_db, get_read_db
+from db.lifecycle import ReleaseSessionRoute
+from db.loaders import loader_options
+from models import Birthday, Contribution, Organizer, User
+from schemas.birthdays import BirthdayDetail, BirthdayOut, BirthdayUpdate, CalendarEntry
+from services.birthday_calendar import birthday_calendar, birthdays_between
+from services.outbox import enqueue
+
+Contributor = aliased(User)
+
+router = APIRouter(prefix="/birthdays", tags=["birthdays"], route_class=ReleaseSessionRoute)
+
+# Calendar reads are answered from the in-process calendar; the database is only consulted
+# for its periodic freshness check, or directly (over ix_birthdays_month_day) while the calendar is
+# still being loaded by another request
+def _calendar_response(db: Session, request: Request, response: Response, start: date, end: date):
+    if not birthday_calendar.ensure_fresh(db):
+        return birthdays_between(db, start, end)
+    not_modified = conditional_response(
+        request, response, "calendar", birthday_calendar.last_modified, birthday_calendar.version, start, end,
+    )
+    if not_modified:
+        return not_modified
+    return birthday_calendar.between(start, end)
+
+# Home page: who has a birthday in the next `days` days, wrapping into January when needed
+@router.get("/upcoming", response_model=List[CalendarEntry])
+def upcoming(
+    request: Request,
+    response: Response,
+    days: int = Query(30, ge=0, le=366),
+    db: Session = Depends(get_read_db),
+):
+    today = date.today()
+    return _calendar_response(db, request, response, today, today + timedelta(days=days))
+
+@router.get("/today", response_model=List[CalendarEntry])
+def today(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    today = date.today()
+    return _calendar_response(db, request, response, today, today)
+
+@router.get("/calendar", response_model=List[CalendarEntry])
+def calendar_window(
+    request: Request,
+    response: Response,
+    start: date,
+    end: date,
+    db: Session = Depends(get_read_db),
+):
+    if end < start or (end - start).days > 366:
+        raise HTTPException(status_code=400, detail="end must be on or after start and at most 366 days later")
+    return _calendar_response(db, request, response, start, end)
+
+@router.get("/{birthday_id}", response_model=BirthdayDetail, response_model_exclude_unset=True)
+def get_birthday(
+    birthday_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of birthday fields"),
+    db: Session = Depends(get_read_db),
+):
+    names = parse_fields(fields, BirthdayDetail)
+    # The detail changes whenever the birthday, its celebrant, organizer, contributions or contributors do
+    row = db.execute(
+        select(
+            Birthday.updated_at,
+            User.updated_at.label("user_updated_at"),
+            select(func.max(Organizer.updated_at)).where(Organizer.birthday_id == Birthday.id)
+            .scalar_subquery().label("organizer_updated_at"),
+            select(func.max(Contribution.updated_at)).where(Contribution.birthday_id == Birthday.id)
+            .scalar_subquery().label("contributions_updated_at"),
+            # Each contribution embeds its contributor's summary, so their edits change the response too
+            select(func.max(Contributor.updated_at))
+            .join(Contribution, Contribution.contributor_id == Contributor.id)
+            .where(Contribution.birthday_id == Birthday.id)
+            .scalar_subquery().label("contributors_updated_at"),
+            select(func.count(Contribution.id)).where(Contribution.birthday_id == Birthday.id)
+            .scalar_subquery().label("contribution_count"),
+        )
+        .join(User, Birthday.user_id == User.id)
+        .where(Birthday.id == birthday_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Birthday not found")
+    last_modified = max(
+        filter(None, (
+            row.updated_at, row.user_updated_at, row.organizer_updated_at,
+            row.contributions_updated_at, row.contributors_updated_at,
+        )),
+        default=None,
+    )
+    not_modified = conditional_response(
+        request, response, "birthday", last_modified, birthday_id, row.contribution_count, fields,
+    )
+    if not_modified:
+        return not_modified
+
+    # One query for the birthday, celebrant and organizer, one more for contributions and their contributors
+    options = ([load_only_option(Birthday, names)] if names else []) + loader_options("birthday_detail", only=names)
+    return project(BirthdayDetail, db.get(Birthday, birthday_id, options=options), names)
+
+# Starting a collection only records an outbox message; invites and payment requests are
+# fanned out by the relay, so this request never waits on notification delivery
+@router.patch("/{birthday_id}", response_model=BirthdayOut)
+def update_birthday(birthday_id: UUID, body: BirthdayUpdate, db: Session = Depends(get_db)):
+    birthday = db.get(Birthday, birthday_id, with_for_update=True)
+    if birthday is None:
+        raise HTTPException(status_code=404, detail="Birthday not found")
+    if body.status == "collecting" and birthday.status != "collecting":
+        enqueue(db, "birthday.collecting", {"birthday_id": str(birthday.id)})
+    birthday.status = body.status
+    db.commit()
+    return birthday
@@ -0,0 +1,109 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from core.fieldsets import project
+from core.http_cache import conditional_response
+from db.database import get_db, get_read_db
+from db.lifecycle import ReleaseSessionRoute
+from db.loaders import loader_options
+from models import Birthday, Contribution, Organizer, User
+from schemas.birthdays import (
+    BulkContributionCreate, BulkContributionResult, ContributionCreate, ContributionOut, ContributionUpdate,
+    GiftProgress, MarkPaidRequest, MarkPaidResult,
+)
+from services.contributions import UnknownContributorError, bulk_create, mark_paid
+
+router = APIRouter(tags=["contributions"], route_class=ReleaseSessionRoute)
+
+# Write responses echo the contribution itself; the contributor summary is only loaded for lists
+WRITE_FIELDS = set(ContributionOut.model_fields) - {"contributor"}
+
+# Gift progress is read from the maintained totals: one row, no aggregation over contributions
+@router.get("/birthdays/{birthday_id}/progress", response_model=GiftProgress)
+def get_progress(birthday_id: UUID, request: Request, response: Response, db: Session = Depends(get_read_db)):
+    row = db.execute(
+        select(
+            Birthday.id.label("birthday_id"), Birthday.pledged_total, Birthday.paid_total,
+            Birthday.contributor_count, Birthday.updated_at, Organizer.total_amount.label("target_amount"),
+        )
+        .outerjoin(Organizer, Organizer.birthday_id == Birthday.id)
+        .where(Birthday.id == birthday_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Birthday not found")
+    not_modified = conditional_response(
+        request, response, "birthday", row.updated_at, birthday_id, row.pledged_total, row.paid_total, row.target_amount,
+    )
+    if not_modified:
+        return not_modified
+    return row._mapping
+
+@router.get("/birthdays/{birthday_id}/contributions", response_model=List[ContributionOut])
+def list_contributions(birthday_id: UUID, db: Session = Depends(get_read_db)):
+    return db.scalars(
+        select(Contribution)
+        .where(Contribution.birthday_id == birthday_id)
+        .order_by(Contribution.created_at)
+        .options(*loader_options("contribution_list"))
+    ).all()
+
+@router.post("/birthdays/{birthday_id}/contributions", response_model=ContributionOut, response_model_exclude_unset=True, status_code=201)
+def create_contribution(birthday_id: UUID, body: ContributionCreate, db: Session = Depends(get_db)):
+    if db.get(Birthday, birthday_id) is None:
+        raise HTTPException(status_code=404, detail="Birthday not found")
+    contribution = Contribution(birthday_id=birthday_id, **body.model_dump())
+    db.add(contribution)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Either uq_contribution_unique or the contributor foreign key
+        db.rollback()
+        if db.get(User, body.contributor_id) is None:
+            raise HTTPException(status_code=404, detail="Contributor not found")
+        raise HTTPException(status_code=409, detail="This user already contributes to this birthday")
+    return project(ContributionOut, contribution, WRITE_FIELDS)
+
+# Invites a whole team in one statement; users who already contribute are reported as skipped
+@router.post("/birthdays/{birthday_id}/contributions/bulk", response_model=BulkContributionResult, response_model_exclude_unset=True, status_code=201)
+def bulk_create_contributions(birthday_id: UUID, body: BulkContributionCreate, db: Session = Depends(get_db)):
+    birthday = db.get(Birthday, birthday_id)
+    if birthday is None:
+        raise HTTPException(status_code=404, detail="Birthday not found")
+    try:
+        rows = bulk_create(db, birthday, body.contributor_ids, body.amount, body.paid)
+    except UnknownContributorError as e:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=str(e))
+    except IntegrityError:
+        # A contributor deleted between the check and the INSERT
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Contributor not found")
+    return {"created": [row._mapping for row in rows], "skipped": len(set(body.contributor_ids)) - len(rows)}
+
+@router.post("/birthdays/{birthday_id}/contributions/mark-paid", response_model=MarkPaidResult, response_model_exclude_unset=True)
+def mark_contributions_paid(birthday_id: UUID, body: MarkPaidRequest, db: Session = Depends(get_db)):
+    return {"updated": [row._mapping for row in mark_paid(db, birthday_id, body.contribution_ids)]}
+
+# The row is locked before it is read: the totals delta is computed from these values, so a concurrent
+# PATCH or mark-paid must not change them in between
+@router.patch("/contributions/{contribution_id}", response_model=ContributionOut, response_model_exclude_unset=True)
+def update_contribution(contribution_id: UUID, body: ContributionUpdate, db: Session = Depends(get_db)):
+    contribution = db.get(Contribution, contribution_id, with_for_update=True)
+    if contribution is None:
+        raise HTTPException(status_code=404, detail="Contribution not found")
+    for name, value in body.model_dump(exclude_unset=True).items():
+        setattr(contribution, name, value)
+    db.commit()
+    return project(ContributionOut, contribution, WRITE_FIELDS)
+
+@router.delete("/contributions/{contribution_id}", status_code=204)
+def delete_contribution(contribution_id: UUID, db: Session = Depends(get_db)):
+    contribution = db.get(Contribution, contribution_id, with_for_update=True)
+    if contribution is None:
+        raise HTTPException(status_code=404, detail="Contribution not found")
+    db.delete(contribution)
+    db.commit()
+    return Response(status_code=204)
@@ -0,0 +1,20 @@
+from typing import Literal
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from services.export import MEDIA_TYPES, stream_export
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+# Full table dumps for finance and HR, streamed as NDJSON or CSV and optionally gzipped on the fly
+@router.get("/{table}")
+def export_table(
+    table: Literal["users", "birthdays", "contributions"],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    compress: bool = False,
+):
+    filename = f"{table}.{format}" + (".gz" if compress else "")
+    return StreamingResponse(
+        stream_export(table, format, compress),
+        media_type="application/gzip" if compress else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
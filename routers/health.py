@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Request, Response
+from db.database import get_pool_metrics
+from db.engines import engines
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("")
+def health():
+    return {"status": "ok"}
+
+# Pool occupancy and checkout wait times for this worker process
+@router.get("/db-pool")
+def db_pool():
+    return get_pool_metrics()
+
+@router.get("/replicas")
+def replica_status():
+    return engines.replicas.status()
+
+# Where this worker's cold start went: router imports and lifespan hooks
+@router.get("/startup")
+def startup_report(request: Request):
+    return request.app.state.startup_profile.report()
+
+# Readiness probe: 503 until the startup warm-up has finished, and again once shutdown begins
+@router.get("/ready")
+def ready(request: Request, response: Response):
+    if not request.app.state.ready:
+        response.status_code = 503
+        return {"status": "not_ready"}
+    return {"status": "ready"}
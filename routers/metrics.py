@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from core.metrics import collect_snapshots, render
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus text exposition, aggregated across all worker processes when METRICS_DIR is set
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render(collect_snapshots()), media_type="text/plain; version=0.0.4")
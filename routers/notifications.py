@@ -0,0 +1,19 @@
+from datetime import date
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from db.database import get_db
+from db.lifecycle import ReleaseSessionRoute
+from schemas.notifications import CampaignResult
+from services.notification_fanout import CAMPAIGNS
+
+router = APIRouter(prefix="/notifications", tags=["notifications"], route_class=ReleaseSessionRoute)
+
+# Creates a company-wide campaign's notifications in one statement; safe to call more than once
+@router.post("/campaigns/{campaign_type}", response_model=CampaignResult)
+def create_campaign(
+    campaign_type: Literal["monthly_reminder", "birthday_wish"],
+    on: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    return CAMPAIGNS[campaign_type](db, on or date.today())
@@ -0,0 +1,106 @@
+import io
+import tempfile
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from core.fieldsets import load_only_option, parse_fields, project, select_columns
+from core.http_cache import conditional_response
+from core.pagination import encode_cursor, decode_cursor
+from db.database import get_async_read_db, get_db, get_read_db
+from db.lifecycle import ReleaseSessionRoute
+from models.users import User
+from schemas.users import UserOut, UserPage, UserImportResult, UserSummary
+from services.user_import import UserImportError, format_from_content_type, import_users
+from services.user_search import search_users, user_prefix_index
+
+router = APIRouter(prefix="/users", tags=["users"], route_class=ReleaseSessionRoute)
+
+# Directory reads run fully async on the event loop, outside the threadpool.
+# Keyset pagination over (created_at, id), served by ix_users_created_at_id
+@router.get("", response_model=UserPage, response_model_exclude_unset=True)
+async def list_users(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of user fields"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    names = parse_fields(fields, UserOut)
+
+    columns = select_columns(User, names or UserOut.model_fields)
+    stmt = (
+        select(*columns, User.created_at.label("_created_at"), User.id.label("_id"), User.updated_at.label("_updated_at"))
+        .order_by(User.created_at, User.id)
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*decode_cursor(cursor)))
+
+    # Fetching one extra row tells us whether another page exists
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last._created_at, last._id)
+
+    # The validator covers only this page's rows: an edit moves their max(updated_at), an insert or
+    # delete inside the page changes which ids it holds. No whole-table aggregate per scroll request.
+    last_modified = max(filter(None, (row._updated_at for row in rows)), default=None)
+    not_modified = conditional_response(
+        request, response, "directory", last_modified, [row._id for row in rows], limit, cursor, fields,
+    )
+    if not_modified:
+        return not_modified
+    return UserPage(items=[project(UserOut, row, names) for row in items], next_cursor=next_cursor)
+
+# Bulk HR import: the body is streamed to a temp file as it arrives, then staged with COPY and upserted on email
+@router.post("/import", response_model=UserImportResult)
+async def import_users_endpoint(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    db: Session = Depends(get_db),
+):
+    fmt = format or format_from_content_type(request.headers.get("content-type"))
+    with tempfile.TemporaryFile() as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        try:
+            return await run_in_threadpool(import_users, db, stream, fmt)
+        except UserImportError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+# Fuzzy name/email search, backed by the trigram index in Postgres
+@router.get("/search", response_model=List[UserSummary])
+def search(q: str = Query(..., min_length=2), limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_read_db)):
+    return search_users(db, q, limit)
+
+# Type-ahead for people-pickers, answered from the in-process prefix index
+@router.get("/autocomplete", response_model=List[UserSummary])
+def autocomplete(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_read_db)):
+    user_prefix_index.ensure_fresh(db)
+    return user_prefix_index.search(q, limit)
+
+@router.get("/{user_id}", response_model=UserOut, response_model_exclude_unset=True)
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of user fields"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    names = parse_fields(fields, UserOut)
+    row = (await db.execute(select(User.updated_at).where(User.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    not_modified = conditional_response(request, response, "user", row.updated_at, user_id, fields)
+    if not_modified:
+        return not_modified
+    options = [load_only_option(User, names)] if names else []
+    return project(UserOut, await db.get(User, user_id, options=options), names)
@@ -0,0 +1,54 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, undefer
+from core.fieldsets import load_only_option, parse_fields, project, select_columns
+from core.http_cache import conditional_response
+from db.database import get_read_db
+from db.lifecycle import ReleaseSessionRoute
+from models import Wishlist
+from schemas.wishlists import WishlistOut
+
+router = APIRouter(tags=["wishlists"], route_class=ReleaseSessionRoute)
+
+# Lists leave out the Text description unless it is asked for explicitly
+LIST_FIELDS = set(WishlistOut.model_fields) - {"description"}
+
+@router.get("/users/{user_id}/wishlists", response_model=List[WishlistOut], response_model_exclude_unset=True)
+def list_user_wishlists(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of wishlist fields"),
+    db: Session = Depends(get_read_db),
+):
+    names = parse_fields(fields, WishlistOut) or LIST_FIELDS
+    last_modified, total = db.execute(
+        select(func.max(Wishlist.updated_at), func.count(Wishlist.id)).where(Wishlist.user_id == user_id)
+    ).one()
+    not_modified = conditional_response(request, response, "wishlist", last_modified, user_id, total, fields)
+    if not_modified:
+        return not_modified
+    rows = db.execute(
+        select(*select_columns(Wishlist, names)).where(Wishlist.user_id == user_id).order_by(Wishlist.created_at)
+    ).all()
+    return [project(WishlistOut, row, names) for row in rows]
+
+@router.get("/wishlists/{wishlist_id}", response_model=WishlistOut, response_model_exclude_unset=True)
+def get_wishlist(
+    wishlist_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of wishlist fields"),
+    db: Session = Depends(get_read_db),
+):
+    names = parse_fields(fields, WishlistOut)
+    row = db.execute(select(Wishlist.updated_at).where(Wishlist.id == wishlist_id)).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Wishlist not found")
+    not_modified = conditional_response(request, response, "wishlist", row.updated_at, wishlist_id, fields)
+    if not_modified:
+        return not_modified
+    options = [load_only_option(Wishlist, names)] if names else [undefer(Wishlist.description)]
+    return project(WishlistOut, db.get(Wishlist, wishlist_id, options=options), names)
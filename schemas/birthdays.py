@@ -0,0 +1,82 @@
+import datetime as dt
+from decimal import Decimal
+from typing import List, Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
+from schemas.users import UserSummary
+
+class OrganizerOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: Optional[UUID] = None
+    gift_description: Optional[str] = None
+    total_amount: Optional[Decimal] = None
+    updated_at: Optional[dt.datetime] = None
+
+class BirthdayOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: Optional[UUID] = None
+    date: Optional[dt.date] = None
+    status: Optional[str] = None
+    pledged_total: Optional[Decimal] = None
+    paid_total: Optional[Decimal] = None
+    contributor_count: Optional[int] = None
+    updated_at: Optional[dt.datetime] = None
+
+class ContributionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    contributor_id: Optional[UUID] = None
+    amount: Optional[Decimal] = None
+    paid: Optional[bool] = None
+    contributor: Optional[UserSummary] = None
+
+class CalendarEntry(BaseModel):
+    birthday_id: UUID
+    status: Optional[str] = None
+    occurs_on: dt.date
+    days_until: int
+    user: UserSummary
+
+class BirthdayDetail(BirthdayOut):
+    user: Optional[UserSummary] = None
+    organizer: Optional[OrganizerOut] = None
+    contributions: Optional[List[ContributionOut]] = None
+
+class BirthdayUpdate(BaseModel):
+    status: Literal["planned", "collecting", "gift_decided", "completed", "cancelled"]
+
+class ContributionCreate(BaseModel):
+    contributor_id: UUID
+    amount: Decimal = Field(gt=0, max_digits=12, decimal_places=2)
+    paid: bool = False
+
+class ContributionUpdate(BaseModel):
+    amount: Optional[Decimal] = Field(None, gt=0, max_digits=12, decimal_places=2)
+    paid: Optional[bool] = None
+
+class GiftProgress(BaseModel):
+    birthday_id: UUID
+    pledged_total: Decimal
+    paid_total: Decimal
+    contributor_count: int
+    target_amount: Optional[Decimal] = None
+
+class BulkContributionCreate(BaseModel):
+    contributor_ids: List[UUID] = Field(min_length=1, max_length=1000)
+    amount: Decimal = Field(gt=0, max_digits=12, decimal_places=2)
+    paid: bool = False
+
+class BulkContributionResult(BaseModel):
+    created: List[ContributionOut]
+    skipped: int
+
+class MarkPaidRequest(BaseModel):
+    contribution_ids: List[UUID] = Field(min_length=1, max_length=1000)
+
+class MarkPaidResult(BaseModel):
+    updated: List[ContributionOut]
@@ -0,0 +1,5 @@
+from pydantic import BaseModel
+
+class CampaignResult(BaseModel):
+    campaign: str
+    created: int
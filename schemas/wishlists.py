@@ -0,0 +1,14 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+class WishlistOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: Optional[UUID] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    link: Optional[str] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,49 @@
+import argparse
+import importlib.util
+import os
+import uvicorn
+from core.config import settings
+
+# Cores this process may actually run on, which inside a container can be fewer than the host has
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def default_workers() -> int:
+    return settings.WEB_WORKERS or available_cpus()
+
+# uvloop and httptools are C implementations of the event loop and HTTP parser; fall back when not installed
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+# Usage: python server.py [--workers 4] [--port 8000]
+# Every worker has its own connection pool, so the database sees up to
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API with production server settings")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--keep-alive", type=int, default=settings.SERVER_KEEP_ALIVE_SECONDS)
+    parser.add_argument("--backlog", type=int, default=settings.SERVER_BACKLOG)
+    parser.add_argument("--limit-concurrency", type=int, default=settings.SERVER_LIMIT_CONCURRENCY)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS)
+    parser.add_argument("--access-log", action=argparse.BooleanOptionalAction, default=settings.SERVER_ACCESS_LOG)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        "main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency or None,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        access_log=args.access_log,
+    )
@@ -0,0 +1,298 @@
+import calendar
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, event, extract, func, inspect, or_, select, tuple_
+from sqlalchemy.orm import Session
+from core.config import settings
+from models import Birthday, User
+
+MonthDay = Tuple[int, int]
+
+# Same expressions as ix_birthdays_month_day, so the window filter is an index range scan
+BIRTHDAY_MONTH_DAY = tuple_(extract("month", Birthday.date), extract("day", Birthday.date))
+
+# Feb 29 birthdays are celebrated on Feb 28 in non-leap years
+def occurrence_in_year(birth_date: date, year: int) -> date:
+    if birth_date.month == 2 and birth_date.day == 29 and not calendar.isleap(year):
+        return date(year, 2, 28)
+    return birth_date.replace(year=year)
+
+def next_occurrence(birth_date: date, on_or_after: date) -> date:
+    occurrence = occurrence_in_year(birth_date, on_or_after.year)
+    if occurrence < on_or_after:
+        occurrence = occurrence_in_year(birth_date, on_or_after.year + 1)
+    return occurrence
+
+# Inclusive (month, day) ranges covering the window; two ranges when it wraps from December into January
+def month_day_ranges(start: date, end: date) -> List[Tuple[MonthDay, MonthDay]]:
+    if end < start:
+        raise ValueError("end must not be before start")
+    if (end - start).days >= 365:
+        return [((1, 1), (12, 31))]
+
+    upper = (end.month, end.day)
+    if upper == (2, 28) and not calendar.isleap(end.year):
+        upper = (2, 29)
+    if start.year == end.year:
+        return [((start.month, start.day), upper)]
+    return [((start.month, start.day), (12, 31)), ((1, 1), upper)]
+
+def _calendar_entry(birthday_id, birth_date: date, status, user: dict, start: date) -> dict:
+    occurs_on = next_occurrence(birth_date, start)
+    return {
+        "birthday_id": birthday_id,
+        "status": status,
+        "occurs_on": occurs_on,
+        "days_until": (occurs_on - start).days,
+        "user": user,
+    }
+
+def _sort_entries(entries: list) -> list:
+    entries.sort(key=lambda item: (item["occurs_on"], item["user"]["last_name"] or "", item["user"]["email"]))
+    return entries
+
+def birthdays_between(db: Session, start: date, end: date) -> list:
+    window = or_(*(
+        and_(BIRTHDAY_MONTH_DAY >= tuple_(*lower), BIRTHDAY_MONTH_DAY <= tuple_(*upper))
+        for lower, upper in month_day_ranges(start, end)
+    ))
+    rows = db.execute(
+        select(
+            Birthday.id.label("birthday_id"), Birthday.date, Birthday.status,
+            User.id.label("user_id"), User.email, User.first_name, User.last_name,
+        )
+        .join(User, Birthday.user_id == User.id)
+        .where(window)
+    ).all()
+
+    return _sort_entries([
+        _calendar_entry(
+            row.birthday_id, row.date, row.status,
+            {"id": row.user_id, "email": row.email, "first_name": row.first_name, "last_name": row.last_name},
+            start,
+        )
+        for row in rows
+    ])
+
+# Position in a leap year (1..366), so Feb 29 has its own slot between Feb 28 and Mar 1
+def day_key(month: int, day: int) -> int:
+    return date(2000, month, day).timetuple().tm_yday
+
+CALENDAR_COLUMNS = (
+    Birthday.id, Birthday.user_id, Birthday.date, Birthday.status,
+    User.email, User.first_name, User.last_name,
+)
+
+def _user_summary(user_id, email, first_name, last_name) -> dict:
+    return {"id": user_id, "email": email, "first_name": first_name, "last_name": last_name}
+
+# In-process calendar: birthdays sorted by day of year in a compact array, with a parallel list of ids,
+# so any date window is a couple of bisects. Changes committed through the ORM in this process are applied
+# to the arrays on commit, from values captured at flush. Changes made elsewhere are picked up every
+# CALENDAR_REFRESH_SECONDS by fetching only the rows updated since the last check; a full rebuild happens
+# on first load and when the row count shows a delete that the incremental fetch cannot see.
+# `version` goes up with every change that reaches the arrays and is part of the calendar ETag:
+# timestamps from this process's clock and the database's can't be compared reliably.
+class BirthdayCalendar:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._keys = array("H")
+        self._ids = []
+        self._entries = {}
+        self._by_user = {}
+        self._loaded = False
+        self._birthdays_seen = None
+        self._users_seen = None
+        self._checked_at = 0.0
+        self.version = 0
+        self.last_modified = None
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # Last-Modified is informational; it moves forward whenever the version does
+    def _changed(self):
+        now = datetime.now(timezone.utc)
+        self.version += 1
+        if self.last_modified is None or now > self.last_modified:
+            self.last_modified = now
+
+    def _row_item(self, row) -> tuple:
+        user = _user_summary(row.user_id, row.email, row.first_name, row.last_name)
+        return day_key(row.date.month, row.date.day), row.date, row.status, user
+
+    def rebuild(self, rows):
+        items = {row.id: self._row_item(row) for row in rows}
+        order = sorted(items, key=lambda birthday_id: items[birthday_id][0])
+        with self._lock:
+            self._entries = items
+            self._by_user = {item[3]["id"]: birthday_id for birthday_id, item in items.items()}
+            self._keys = array("H", (items[birthday_id][0] for birthday_id in order))
+            self._ids = order
+            self._changed()
+            self._loaded = True
+
+    # Rows the refresh overlap fetches again unchanged leave the version alone
+    def _put(self, birthday_id, item: tuple):
+        with self._lock:
+            if self._entries.get(birthday_id) == item:
+                return
+            self._discard(birthday_id)
+            i = bisect_right(self._keys, item[0])
+            self._keys.insert(i, item[0])
+            self._ids.insert(i, birthday_id)
+            self._entries[birthday_id] = item
+            self._by_user[item[3]["id"]] = birthday_id
+            self._changed()
+
+    def upsert(self, row):
+        self._put(row.id, self._row_item(row))
+
+    def remove(self, birthday_id):
+        with self._lock:
+            self._discard(birthday_id)
+
+    def _discard(self, birthday_id):
+        item = self._entries.pop(birthday_id, None)
+        if item is None:
+            return
+        self._changed()
+        if self._by_user.get(item[3]["id"]) == birthday_id:
+            del self._by_user[item[3]["id"]]
+        lo, hi = bisect_left(self._keys, item[0]), bisect_right(self._keys, item[0])
+        i = self._ids.index(birthday_id, lo, hi)
+        del self._keys[i]
+        del self._ids[i]
+
+    # A birthday written in this process. Values the flush did not have (e.g. the celebrant of a new
+    # birthday whose user was never loaded) come from the current entry; failing that, the next request
+    # does an incremental check, which picks the row up from the database.
+    def apply_birthday(self, birthday_id, user_id, birth_date: Optional[date], status, user: Optional[dict]):
+        with self._lock:
+            current = self._entries.get(birthday_id)
+            if current is not None and current[3]["id"] == user_id:
+                birth_date = birth_date or current[1]
+                user = user or current[3]
+            if user is None or birth_date is None:
+                self._checked_at = 0.0
+                return
+            self._put(birthday_id, (day_key(birth_date.month, birth_date.day), birth_date, status, user))
+
+    def apply_user(self, user: dict):
+        with self._lock:
+            birthday_id = self._by_user.get(user["id"])
+            if birthday_id is not None and self._entries[birthday_id][3] != user:
+                key, birth_date, status, _ = self._entries[birthday_id]
+                self._entries[birthday_id] = (key, birth_date, status, user)
+                self._changed()
+
+    def between(self, start: date, end: date) -> list:
+        entries = []
+        with self._lock:
+            for lower, upper in month_day_ranges(start, end):
+                lo = bisect_left(self._keys, day_key(*lower))
+                hi = bisect_right(self._keys, day_key(*upper))
+                for birthday_id in self._ids[lo:hi]:
+                    _, birth_date, status, user = self._entries[birthday_id]
+                    entries.append(_calendar_entry(birthday_id, birth_date, status, user, start))
+        return _sort_entries(entries)
+
+    def _refresh(self, db: Session):
+        birthdays_max, count, users_max = db.execute(select(
+            func.max(Birthday.updated_at),
+            func.count(Birthday.id),
+            select(func.max(User.updated_at)).scalar_subquery(),
+        )).one()
+        calendar_rows = select(*CALENDAR_COLUMNS).join(User, Birthday.user_id == User.id)
+        if self._loaded and (birthdays_max, users_max) != (self._birthdays_seen, self._users_seen):
+            # Rows updated since the last check, with an overlap for transactions that committed late
+            overlap = timedelta(seconds=settings.CALENDAR_REFRESH_SECONDS)
+            changed = []
+            if self._birthdays_seen is not None:
+                changed.append(Birthday.updated_at > self._birthdays_seen - overlap)
+            if self._users_seen is not None:
+                changed.append(User.updated_at > self._users_seen - overlap)
+            rows = db.execute(calendar_rows.where(or_(*changed)) if changed else calendar_rows).all()
+            for row in rows:
+                self.upsert(row)
+        if not self._loaded or count != self.size:
+            self.rebuild(db.execute(calendar_rows).all())
+        self._birthdays_seen, self._users_seen = birthdays_max, users_max
+
+    # Returns False while the calendar has never been loaded and another request is loading it;
+    # the caller then answers from the database (birthdays_between) instead of waiting
+    def ensure_fresh(self, db: Session) -> bool:
+        if time.monotonic() - self._checked_at < settings.CALENDAR_REFRESH_SECONDS:
+            return self._loaded
+        if not self._refresh_lock.acquire(blocking=False):
+            return self._loaded
+        try:
+            self._refresh(db)
+            self._checked_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+        return True
+
+
+birthday_calendar = BirthdayCalendar()
+
+# Birthday and celebrant changes committed in this process reach the calendar straight away.
+# The mapper events capture the flushed values without querying; they are applied after commit.
+def _queue(session, change):
+    if session is not None:
+        session.info.setdefault("calendar_changes", []).append(change)
+
+def _loaded_user(state) -> Optional[dict]:
+    user = state.dict.get("user")
+    if user is None:
+        return None
+    values = inspect(user).dict
+    if not all(name in values for name in ("id", "email", "first_name", "last_name")):
+        return None
+    return _user_summary(values["id"], values["email"], values["first_name"], values["last_name"])
+
+def _track_birthday_upsert(mapper, connection, target):
+    state = inspect(target)
+    _queue(state.session, (
+        "birthday",
+        (target.id, state.dict.get("user_id"), state.dict.get("date"), state.dict.get("status"), _loaded_user(state)),
+    ))
+
+def _track_birthday_delete(mapper, connection, target):
+    _queue(Session.object_session(target), ("remove", target.id))
+
+def _track_user_update(mapper, connection, target):
+    values = inspect(target).dict
+    if all(name in values for name in ("id", "email", "first_name", "last_name")):
+        _queue(Session.object_session(target), (
+            "user", _user_summary(values["id"], values["email"], values["first_name"], values["last_name"]),
+        ))
+
+event.listen(Birthday, "after_insert", _track_birthday_upsert)
+event.listen(Birthday, "after_update", _track_birthday_upsert)
+event.listen(Birthday, "after_delete", _track_birthday_delete)
+event.listen(User, "after_update", _track_user_update)
+
+@event.listens_for(Session, "after_commit")
+def _apply_calendar_changes(session):
+    for action, value in session.info.pop("calendar_changes", []):
+        if action == "birthday":
+            birthday_calendar.apply_birthday(*value)
+        elif action == "user":
+            birthday_calendar.apply_user(value)
+        else:
+            birthday_calendar.remove(value)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_calendar_changes(session):
+    session.info.pop("calendar_changes", None)
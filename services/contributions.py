@@ -0,0 +1,124 @@
+import argparse
+import json
+from decimal import Decimal
+from typing import List
+from uuid import UUID
+from sqlalchemy import any_, bindparam, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.orm import Session
+from models import Birthday, Contribution, User
+from models.contribution import ZERO, add_delta, apply_deltas, contribution_delta
+
+RETURNED_COLUMNS = (Contribution.id, Contribution.contributor_id, Contribution.amount, Contribution.paid)
+
+class UnknownContributorError(ValueError):
+    pass
+
+# One multi-row INSERT; users who already contribute are skipped by uq_contribution_unique and only
+# the rows actually inserted come back, so the totals get exactly one delta for the whole batch.
+# Ids that are not users are rejected up front instead of failing the INSERT on the foreign key.
+def bulk_create(db: Session, birthday: Birthday, contributor_ids: List[UUID], amount: Decimal, paid: bool = False) -> list:
+    contributor_ids = [cid for cid in dict.fromkeys(contributor_ids) if cid != birthday.user_id]
+    if not contributor_ids:
+        return []
+    known = set(db.scalars(select(User.id).where(User.id.in_(contributor_ids))))
+    unknown = [cid for cid in contributor_ids if cid not in known]
+    if unknown:
+        raise UnknownContributorError(f"Unknown contributor ids: {', '.join(map(str, unknown))}")
+    rows = db.execute(
+        insert(Contribution)
+        .values([
+            {"birthday_id": birthday.id, "contributor_id": cid, "amount": amount, "paid": paid}
+            for cid in contributor_ids
+        ])
+        .on_conflict_do_nothing(constraint="uq_contribution_unique")
+        .returning(*RETURNED_COLUMNS)
+    ).all()
+    deltas = {}
+    for row in rows:
+        add_delta(deltas, birthday.id, contribution_delta(row.amount, row.paid, 1))
+    apply_deltas(db.connection(), deltas)
+    db.commit()
+    return rows
+
+# A single UPDATE ... WHERE id = ANY(:ids) RETURNING; rows that were already paid are not returned
+# and do not count towards paid_total twice
+def mark_paid(db: Session, birthday_id: UUID, contribution_ids: List[UUID]) -> list:
+    ids = bindparam("ids", list(dict.fromkeys(contribution_ids)), type_=ARRAY(PG_UUID(as_uuid=True)))
+    rows = db.execute(
+        update(Contribution)
+        .where(
+            Contribution.id == any_(ids),
+            Contribution.birthday_id == birthday_id,
+            Contribution.paid.isnot(True),
+        )
+        .values(paid=True)
+        .returning(*RETURNED_COLUMNS),
+        execution_options={"synchronize_session": False},
+    ).all()
+    paid = sum((row.amount for row in rows), ZERO)
+    apply_deltas(db.connection(), {birthday_id: (ZERO, paid, 0)})
+    db.commit()
+    return rows
+
+def _actual_totals():
+    return (
+        select(
+            Contribution.birthday_id,
+            func.sum(Contribution.amount).label("pledged_total"),
+            func.sum(Contribution.amount).filter(Contribution.paid.is_(True)).label("paid_total"),
+            func.count(Contribution.id).label("contributor_count"),
+        )
+        .group_by(Contribution.birthday_id)
+        .subquery()
+    )
+
+# Aggregates recomputed from contributions at statement time, for rewriting a drifted birthday
+def _recomputed(column):
+    return select(column).where(Contribution.birthday_id == Birthday.id).scalar_subquery()
+
+# Compares the stored aggregates with a fresh GROUP BY and, with fix=True, recomputes the drifted rows
+def reconcile_totals(db: Session, fix: bool = False) -> list:
+    actual = _actual_totals()
+    pledged = func.coalesce(actual.c.pledged_total, 0)
+    paid = func.coalesce(actual.c.paid_total, 0)
+    count = func.coalesce(actual.c.contributor_count, 0)
+    rows = db.execute(
+        select(
+            Birthday.id.label("birthday_id"),
+            Birthday.pledged_total, Birthday.paid_total, Birthday.contributor_count,
+            pledged.label("actual_pledged_total"), paid.label("actual_paid_total"), count.label("actual_contributor_count"),
+        )
+        .outerjoin(actual, actual.c.birthday_id == Birthday.id)
+        .where(or_(Birthday.pledged_total != pledged, Birthday.paid_total != paid, Birthday.contributor_count != count))
+    ).all()
+    if fix and rows:
+        # Locked first, in its own statement: writers adjust the totals under this row lock, so once it is
+        # held every contribution whose delta was applied has committed, and the UPDATE's fresh snapshot
+        # (READ COMMITTED) counts all of them. Writers still in flight wait and add their delta afterwards.
+        drifted = [row.birthday_id for row in rows]
+        db.execute(select(Birthday.id).where(Birthday.id.in_(drifted)).order_by(Birthday.id).with_for_update())
+        db.execute(
+            update(Birthday)
+            .where(Birthday.id.in_(drifted))
+            .values(
+                pledged_total=func.coalesce(_recomputed(func.sum(Contribution.amount)), 0),
+                paid_total=func.coalesce(_recomputed(func.sum(Contribution.amount).filter(Contribution.paid.is_(True))), 0),
+                contributor_count=_recomputed(func.count(Contribution.id)),
+            )
+        )
+        db.commit()
+    return [dict(row._mapping) for row in rows]
+
+# Usage: python -m services.contributions [--fix]
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Verify denormalized contribution totals on birthdays")
+    parser.add_argument("--fix", action="store_true", help="Rewrite totals that do not match the contributions")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        mismatches = reconcile_totals(db, fix=args.fix)
+    print(json.dumps(mismatches, default=str, indent=2))
+    raise SystemExit(1 if mismatches and not args.fix else 0)
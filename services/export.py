@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+from db.database import SessionLocal
+from models import Birthday, Contribution, User
+
+EXPORT_BATCH_SIZE = 1000
+
+# Columns included in each dump; bank_details is deliberately left out of the users export
+EXPORTS = {
+    "users": [User.id, User.email, User.first_name, User.last_name, User.role, User.created_at, User.updated_at],
+    "birthdays": [Birthday.id, Birthday.user_id, Birthday.date, Birthday.status, Birthday.created_at, Birthday.updated_at],
+    "contributions": [
+        Contribution.id, Contribution.birthday_id, Contribution.contributor_id, Contribution.organizer_id,
+        Contribution.amount, Contribution.paid, Contribution.created_at, Contribution.updated_at,
+    ],
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _format_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+def _encode_ndjson(keys, rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(keys, (_format_value(v) for v in row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_format_value(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+# Generator for StreamingResponse: rows come off a server-side cursor one batch at a time,
+# so memory stays flat no matter how large the table is
+def stream_export(table: str, fmt: str = "ndjson", compress: bool = False):
+    columns = EXPORTS[table]
+    keys = [column.key for column in columns]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(chunk: str) -> bytes:
+        data = chunk.encode()
+        return compressor.compress(data) if compressor else data
+
+    with SessionLocal(use_replica=True) as db:
+        stmt = select(*columns).order_by(columns[0]).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        result = db.execute(stmt)
+        if fmt == "csv":
+            yield emit(_encode_csv([keys]))
+        for partition in result.partitions():
+            chunk = _encode_csv(partition) if fmt == "csv" else _encode_ndjson(keys, partition)
+            data = emit(chunk)
+            if data:
+                yield data
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,107 @@
+import argparse
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+from sqlalchemy import false, select
+from sqlalchemy.orm import Session
+from core.config import settings
+from db.loaders import loader_options
+from models import Notification
+from services.notification_senders import NOTIFICATION_TYPES, configured_sender
+
+logger = logging.getLogger(__name__)
+
+# Delivery function per notification type. Types without a sender are never claimed: they stay
+# pending until one is registered instead of being marked sent without being delivered.
+SENDERS: Dict[str, Callable[[Notification], None]] = {}
+
+def register_sender(notification_type: str):
+    def decorator(fn):
+        SENDERS[notification_type] = fn
+        return fn
+    return decorator
+
+# Registers the NOTIFICATION_SENDER delivery for every notification type that has no sender yet
+def register_configured_senders():
+    sender = configured_sender()
+    if sender is not None:
+        for notification_type in NOTIFICATION_TYPES:
+            SENDERS.setdefault(notification_type, sender)
+
+# Due, unsent rows are claimed with FOR UPDATE SKIP LOCKED over ix_notifications_due, so parallel
+# workers each take a different batch and never block on rows another worker is already sending
+def claim_due(db: Session, batch_size: int, now: datetime) -> list:
+    if not SENDERS:
+        return []
+    return db.scalars(
+        select(Notification)
+        .where(
+            Notification.is_sent == false(),
+            Notification.failed_at.is_(None),
+            Notification.scheduled_at <= now,
+            Notification.type.in_(list(SENDERS)),
+        )
+        .order_by(Notification.scheduled_at)
+        .limit(batch_size)
+        .options(*loader_options("notification_delivery"))
+        .with_for_update(skip_locked=True)
+    ).all()
+
+# Sends one batch inside one transaction; row locks are held until the commit marks them sent.
+# A failed delivery is pushed back by NOTIFICATION_RETRY_SECONDS instead of blocking the queue,
+# and after NOTIFICATION_MAX_ATTEMPTS it is marked failed and no longer claimed.
+def dispatch_batch(db: Session, batch_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    notifications = claim_due(db, batch_size, now)
+    for notification in notifications:
+        try:
+            SENDERS[notification.type](notification)
+        except Exception as exc:
+            notification.attempts += 1
+            notification.last_error = repr(exc)
+            if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                logger.exception("Notification %s failed after %d attempts", notification.id, notification.attempts)
+                notification.failed_at = now
+            else:
+                logger.warning("Delivering notification %s failed, retrying", notification.id, exc_info=True)
+                notification.scheduled_at = now + timedelta(seconds=settings.NOTIFICATION_RETRY_SECONDS)
+            continue
+        notification.is_sent = True
+        notification.sent_at = datetime.now(timezone.utc)
+    db.commit()
+    return len(notifications)
+
+def run_worker(session_factory, batch_size: int, poll_interval: float, stop: threading.Event):
+    if not SENDERS:
+        raise RuntimeError("No notification senders are registered; set NOTIFICATION_SENDER")
+    while not stop.is_set():
+        with session_factory() as db:
+            claimed = dispatch_batch(db, batch_size)
+        # A full batch means there is probably more waiting; otherwise wait for new work
+        if claimed < batch_size:
+            stop.wait(poll_interval)
+
+# Usage: python -m services.notification_dispatch [--once] [--batch-size 100]
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Deliver due notifications")
+    parser.add_argument("--batch-size", type=int, default=settings.NOTIFICATION_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=settings.NOTIFICATION_POLL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Send one batch and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    register_configured_senders()
+    if not SENDERS:
+        parser.error("no notification sender is configured; set NOTIFICATION_SENDER to smtp or log")
+
+    if args.once:
+        with SessionLocal() as db:
+            print(dispatch_batch(db, args.batch_size))
+    else:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        run_worker(SessionLocal, args.batch_size, args.poll_interval, stop)
@@ -0,0 +1,103 @@
+import argparse
+import json
+from datetime import date, datetime, time, timezone
+from typing import Optional
+from sqlalchemy import String, and_, cast, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from core.config import settings
+from models import Birthday, Notification, User
+from services.birthday_calendar import BIRTHDAY_MONTH_DAY, month_day_ranges
+
+FANOUT_COLUMNS = ["id", "user_id", "type", "birthday_id", "campaign", "scheduled_at"]
+
+def _send_time(day: date) -> datetime:
+    return datetime.combine(day, time(settings.NOTIFICATION_SEND_HOUR), tzinfo=timezone.utc)
+
+# One INSERT ... SELECT per campaign; ON CONFLICT on uq_notification_campaign makes re-runs no-ops
+def _insert_from_select(db: Session, rows) -> int:
+    stmt = (
+        insert(Notification)
+        .from_select(FANOUT_COLUMNS, rows)
+        .on_conflict_do_nothing(constraint="uq_notification_campaign")
+    )
+    return db.execute(stmt).rowcount
+
+# Everyone gets a reminder about the coming month's birthdays, provided there are any
+def fan_out_monthly_reminder(db: Session, month: date, scheduled_at: Optional[datetime] = None) -> dict:
+    month = month.replace(day=1)
+    campaign = f"monthly_reminder:{month:%Y-%m}"
+    has_birthdays = select(Birthday.id).where(func.extract("month", Birthday.date) == month.month).exists()
+    rows = select(
+        func.uuid_generate_v7(),
+        User.id,
+        literal("monthly_reminder"),
+        literal(None, type_=Notification.birthday_id.type),
+        literal(campaign),
+        literal(scheduled_at or _send_time(month), type_=Notification.scheduled_at.type),
+    ).where(has_birthdays)
+    created = _insert_from_select(db, rows)
+    db.commit()
+    return {"campaign": campaign, "created": created}
+
+# Everyone except the celebrant gets a wish notification for each birthday falling on `day`
+def fan_out_birthday_wishes(db: Session, day: date, scheduled_at: Optional[datetime] = None) -> dict:
+    campaign_prefix = f"birthday_wish:{day.isoformat()}:"
+    on_day = or_(*(
+        and_(BIRTHDAY_MONTH_DAY >= tuple_(*lower), BIRTHDAY_MONTH_DAY <= tuple_(*upper))
+        for lower, upper in month_day_ranges(day, day)
+    ))
+    rows = (
+        select(
+            func.uuid_generate_v7(),
+            User.id,
+            literal("birthday_wish"),
+            Birthday.id,
+            literal(campaign_prefix) + cast(Birthday.id, String),
+            literal(scheduled_at or _send_time(day), type_=Notification.scheduled_at.type),
+        )
+        .select_from(Birthday)
+        .join(User, User.id != Birthday.user_id)
+        .where(on_day, Birthday.status != "cancelled")
+    )
+    created = _insert_from_select(db, rows)
+    db.commit()
+    return {"campaign": campaign_prefix.rstrip(":"), "created": created}
+
+# Gift invites and payment requests for everyone except the celebrant once collection starts.
+# Runs inside the outbox relay's transaction, so it does not commit; the campaign keys keep retries idempotent.
+def fan_out_collection(db: Session, birthday_id, scheduled_at: Optional[datetime] = None) -> dict:
+    created = {}
+    for notification_type in ("gift_invite", "payment_request"):
+        rows = (
+            select(
+                func.uuid_generate_v7(),
+                User.id,
+                literal(notification_type),
+                Birthday.id,
+                literal(f"{notification_type}:{birthday_id}"),
+                literal(scheduled_at or datetime.now(timezone.utc), type_=Notification.scheduled_at.type),
+            )
+            .select_from(Birthday)
+            .join(User, User.id != Birthday.user_id)
+            .where(Birthday.id == birthday_id)
+        )
+        created[notification_type] = _insert_from_select(db, rows)
+    return created
+
+CAMPAIGNS = {
+    "monthly_reminder": fan_out_monthly_reminder,
+    "birthday_wish": fan_out_birthday_wishes,
+}
+
+# Usage: python -m services.notification_fanout monthly_reminder --date 2026-11-01
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Create notifications for a company-wide campaign")
+    parser.add_argument("type", choices=sorted(CAMPAIGNS))
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        print(json.dumps(CAMPAIGNS[args.type](db, args.date)))
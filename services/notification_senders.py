@@ -0,0 +1,74 @@
+import logging
+import smtplib
+from email.message import EmailMessage
+from typing import Optional, Tuple
+from core.config import settings
+from models import Notification
+
+logger = logging.getLogger(__name__)
+
+def _name(user) -> str:
+    return " ".join(filter(None, (user.first_name, user.last_name))) or user.email
+
+def _celebrant(notification: Notification) -> str:
+    return _name(notification.birthday.user) if notification.birthday is not None else "a colleague"
+
+# Subject and body per notification type; the dispatcher only claims types listed here
+def render_message(notification: Notification) -> Tuple[str, str]:
+    greeting = f"Hi {notification.user.first_name or notification.user.email},"
+    if notification.type == "monthly_reminder":
+        return "Birthdays this month", f"{greeting}\n\nThere are colleagues celebrating this month. See who in the Birthday Planner."
+    if notification.type == "gift_invite":
+        celebrant = _celebrant(notification)
+        return f"Chip in for {celebrant}'s gift", f"{greeting}\n\nA collection has started for {celebrant}'s birthday gift."
+    if notification.type == "payment_request":
+        celebrant = _celebrant(notification)
+        return f"Your contribution for {celebrant}", f"{greeting}\n\nPlease pay your contribution towards {celebrant}'s birthday gift."
+    if notification.type == "birthday_wish":
+        return "Happy birthday!", f"{greeting}\n\nHappy birthday from all of us!"
+    raise ValueError(f"No message for notification type {notification.type}")
+
+NOTIFICATION_TYPES = ("monthly_reminder", "gift_invite", "payment_request", "birthday_wish")
+
+# One SMTP connection per worker, reopened when the server drops it between batches
+class SmtpSender:
+    def __init__(self):
+        self._client: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        client = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_STARTTLS:
+            client.starttls()
+        if settings.SMTP_USERNAME:
+            client.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        return client
+
+    def __call__(self, notification: Notification):
+        subject, body = render_message(notification)
+        message = EmailMessage()
+        message["From"] = settings.SMTP_FROM
+        message["To"] = notification.user.email
+        message["Subject"] = subject
+        message.set_content(body)
+        try:
+            if self._client is None:
+                self._client = self._connect()
+            self._client.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self._client = self._connect()
+            self._client.send_message(message)
+
+def log_sender(notification: Notification):
+    subject, body = render_message(notification)
+    logger.info("Notification %s to %s: %s\n%s", notification.id, notification.user.email, subject, body)
+
+def configured_sender():
+    if settings.NOTIFICATION_SENDER == "smtp":
+        if not settings.SMTP_HOST or not settings.SMTP_FROM:
+            raise RuntimeError("NOTIFICATION_SENDER=smtp needs SMTP_HOST and SMTP_FROM")
+        return SmtpSender()
+    if settings.NOTIFICATION_SENDER == "log":
+        return log_sender
+    if settings.NOTIFICATION_SENDER:
+        raise RuntimeError(f"Unknown NOTIFICATION_SENDER: {settings.NOTIFICATION_SENDER}")
+    return None
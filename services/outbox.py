@@ -0,0 +1,100 @@
+import argparse
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.config import settings
+from models import OutboxMessage
+from services.notification_fanout import fan_out_collection
+
+logger = logging.getLogger(__name__)
+
+# Handler per topic; each runs inside the relay's transaction and must be safe to run more than once
+HANDLERS: Dict[str, Callable[[Session, dict], None]] = {}
+
+def register_handler(topic: str):
+    def decorator(fn):
+        HANDLERS[topic] = fn
+        return fn
+    return decorator
+
+# Adds the message to the caller's session, so it commits (or rolls back) together with the change it describes
+def enqueue(db: Session, topic: str, payload: dict) -> OutboxMessage:
+    message = OutboxMessage(topic=topic, payload=payload)
+    db.add(message)
+    return message
+
+def backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(settings.OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.OUTBOX_BACKOFF_MAX_SECONDS))
+
+# Same FOR UPDATE SKIP LOCKED claim as the notification dispatcher, over ix_outbox_pending
+def claim_batch(db: Session, batch_size: int, now: datetime) -> list:
+    return db.scalars(
+        select(OutboxMessage)
+        .where(OutboxMessage.status == "pending", OutboxMessage.available_at <= now)
+        .order_by(OutboxMessage.available_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+# Each handler runs in a savepoint: a failure only undoes that message's work and reschedules it
+# with exponential backoff; after OUTBOX_MAX_ATTEMPTS it is marked dead and left for inspection
+def relay_batch(db: Session, batch_size: int) -> int:
+    now = datetime.now(timezone.utc)
+    messages = claim_batch(db, batch_size, now)
+    for message in messages:
+        handler = HANDLERS.get(message.topic)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for topic {message.topic!r}")
+            with db.begin_nested():
+                handler(db, message.payload)
+        except Exception as exc:
+            message.attempts += 1
+            message.last_error = repr(exc)
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                logger.error("Outbox message %s (%s) is dead after %d attempts", message.id, message.topic, message.attempts)
+                message.status = "dead"
+            else:
+                logger.warning("Outbox message %s (%s) failed, retrying", message.id, message.topic, exc_info=True)
+                message.available_at = now + backoff(message.attempts)
+            continue
+        message.status = "sent"
+        message.sent_at = datetime.now(timezone.utc)
+    db.commit()
+    return len(messages)
+
+def run_relay(session_factory, batch_size: int, poll_interval: float, stop: threading.Event):
+    while not stop.is_set():
+        with session_factory() as db:
+            claimed = relay_batch(db, batch_size)
+        if claimed < batch_size:
+            stop.wait(poll_interval)
+
+@register_handler("birthday.collecting")
+def _birthday_collecting(db: Session, payload: dict):
+    fan_out_collection(db, UUID(payload["birthday_id"]))
+
+# Usage: python -m services.outbox [--once] [--batch-size 50]
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Relay pending outbox messages")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=settings.OUTBOX_POLL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Relay one batch and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.once:
+        with SessionLocal() as db:
+            print(relay_batch(db, args.batch_size))
+    else:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        signal.signal(signal.SIGINT, lambda *_: stop.set())
+        run_relay(SessionLocal, args.batch_size, args.poll_interval, stop)
@@ -0,0 +1,195 @@
+import argparse
+import codecs
+import csv
+import hashlib
+import io
+import json
+from typing import IO, Iterable, Iterator
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+BATCH_SIZE = 5000
+IMPORT_FIELDS = ("email", "first_name", "last_name", "role")
+
+class UserImportError(ValueError):
+    pass
+
+# NDJSON values may be any JSON type; text and numbers are accepted, anything else is a client error
+def _text(record: dict, field: str, number: int) -> str:
+    value = record.get(field)
+    if value is None:
+        return ""
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise UserImportError(f"Invalid {field} in record {number}: expected a string")
+    return str(value).strip()
+
+# Normalises one HR record and hashes its content so unchanged rows can be skipped on upsert
+def _normalize(record: dict, number: int):
+    email = _text(record, "email", number).lower()
+    if not email:
+        return None
+    first_name = _text(record, "first_name", number) or None
+    last_name = _text(record, "last_name", number) or None
+    role = _text(record, "role", number) or "user"
+    digest = hashlib.sha256("\x1f".join([email, first_name or "", last_name or "", role]).encode()).hexdigest()
+    return email, first_name, last_name, role, digest
+
+# Text streams decode ahead in chunks, so the line is found again from the raw bytes (error path only)
+def _not_utf8(stream: IO[str]) -> UserImportError:
+    raw = getattr(stream, "buffer", None)
+    if raw is None or not raw.seekable():
+        return UserImportError("File is not UTF-8 encoded; export it as UTF-8 and retry")
+    raw.seek(0)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    line_no = 1
+    for chunk in iter(lambda: raw.read(1 << 16), b""):
+        try:
+            decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            line_no += chunk.count(b"\n", 0, e.start)
+            break
+        line_no += chunk.count(b"\n")
+    return UserImportError(f"Line {line_no} is not UTF-8 encoded; export the file as UTF-8 and retry")
+
+def _csv_records(stream: IO[str]) -> Iterator[dict]:
+    reader = csv.DictReader(stream)
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # line_num still points at the end of the last good record
+            raise UserImportError(f"Malformed CSV in the record starting on line {reader.line_num + 1}: {e}")
+        except UnicodeDecodeError:
+            raise _not_utf8(stream)
+        yield record
+
+def _ndjson_records(stream: IO[str]) -> Iterator[dict]:
+    lines = iter(stream)
+    line_no = 0
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            raise _not_utf8(stream)
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise UserImportError(f"Invalid JSON on line {line_no}")
+
+def _iter_records(stream: IO[str], fmt: str) -> Iterator[dict]:
+    if fmt == "csv":
+        return _csv_records(stream)
+    if fmt == "ndjson":
+        return _ndjson_records(stream)
+    raise UserImportError(f"Unsupported import format: {fmt}")
+
+def _batches(rows: Iterable, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _copy_batch(db: Session, batch: list):
+    dbapi_conn = db.connection().connection.dbapi_connection
+    cursor = dbapi_conn.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)
+            buffer.seek(0)
+            cursor.copy_expert(
+                "COPY user_import_stage (line, email, first_name, last_name, role, import_hash) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            return
+    finally:
+        cursor.close()
+
+    # Drivers without COPY support fall back to one multi-row INSERT per batch
+    db.execute(
+        text("INSERT INTO user_import_stage (line, email, first_name, last_name, role, import_hash) "
+             "VALUES (:line, :email, :first_name, :last_name, :role, :import_hash)"),
+        [dict(zip(("line",) + IMPORT_FIELDS + ("import_hash",), row)) for row in batch],
+    )
+
+MERGE_SQL = text("""
+    INSERT INTO users (id, email, first_name, last_name, role, import_hash)
+    SELECT DISTINCT ON (email) uuid_generate_v7(), email, first_name, last_name, role, import_hash
+    FROM user_import_stage
+    ORDER BY email, line DESC
+    ON CONFLICT (email) DO UPDATE SET
+        first_name = excluded.first_name,
+        last_name = excluded.last_name,
+        role = excluded.role,
+        import_hash = excluded.import_hash,
+        updated_at = now()
+    WHERE users.import_hash IS DISTINCT FROM excluded.import_hash
+    RETURNING (xmax = 0) AS inserted
+""")
+
+# Stages the whole file with COPY, then upserts on users.email in a single statement
+def import_users(db: Session, stream: IO[str], fmt: str = "csv") -> dict:
+    received = skipped = 0
+
+    def rows():
+        nonlocal received, skipped
+        for record in _iter_records(stream, fmt):
+            received += 1
+            row = _normalize(record, received) if isinstance(record, dict) else None
+            if row is None:
+                skipped += 1
+                continue
+            yield (received,) + row
+
+    db.execute(text(
+        "CREATE TEMP TABLE user_import_stage ("
+        "line bigint, email text, first_name text, last_name text, role text, import_hash text"
+        ") ON COMMIT DROP"
+    ))
+    for batch in _batches(rows(), BATCH_SIZE):
+        _copy_batch(db, batch)
+
+    distinct = db.execute(text("SELECT count(DISTINCT email) FROM user_import_stage")).scalar_one()
+    results = db.execute(MERGE_SQL).scalars().all()
+    db.commit()
+
+    inserted = sum(1 for was_inserted in results if was_inserted)
+    updated = len(results) - inserted
+    return {
+        "received": received,
+        "skipped": skipped,
+        "duplicates": received - skipped - distinct,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": distinct - inserted - updated,
+    }
+
+def format_from_content_type(content_type: str) -> str:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    return "csv"
+
+# Usage: python -m services.user_import employees.csv [--format ndjson]
+if __name__ == "__main__":
+    from db.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bulk import users from an HR export")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "ndjson"))
+    args = parser.parse_args()
+
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    with open(args.path, newline="", encoding="utf-8") as stream, SessionLocal() as db:
+        print(json.dumps(import_users(db, stream, fmt)))
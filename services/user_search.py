@@ -0,0 +1,163 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import timedelta
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import Session
+from core.config import settings
+from models.users import User
+
+SUMMARY_COLUMNS = (User.id, User.email, User.first_name, User.last_name, User.updated_at)
+
+def _terms(summary: dict):
+    first = (summary["first_name"] or "").lower()
+    last = (summary["last_name"] or "").lower()
+    email = summary["email"].lower()
+    terms = {email, email.split("@")[0], first, last, f"{first} {last}".strip(), f"{last} {first}".strip()}
+    return tuple(sorted(term for term in terms if term))
+
+# In-process autocomplete index: a sorted array of (term, user id) pairs searched with bisect.
+# It is refreshed incrementally from users.updated_at and rebuilt periodically to drop deleted rows.
+# Each refresh looks USER_SEARCH_OVERLAP_SECONDS behind its watermark for rows whose transaction committed late.
+class UserPrefixIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._keys = []
+        self._users = {}
+        self._watermark = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+
+    def upsert(self, summary: dict):
+        user_id = str(summary["id"])
+        with self._lock:
+            current = self._users.get(user_id)
+            if current is not None and current[0] == summary:
+                return
+            self._discard(user_id)
+            terms = _terms(summary)
+            self._users[user_id] = (summary, terms)
+            for term in terms:
+                insort(self._keys, (term, user_id))
+
+    def remove(self, user_id):
+        with self._lock:
+            self._discard(str(user_id))
+
+    def _discard(self, user_id: str):
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        for term in entry[1]:
+            i = bisect_left(self._keys, (term, user_id))
+            if i < len(self._keys) and self._keys[i] == (term, user_id):
+                del self._keys[i]
+
+    def search(self, prefix: str, limit: int = 10):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        found = {}
+        with self._lock:
+            i = bisect_left(self._keys, (prefix,))
+            while i < len(self._keys) and len(found) < limit:
+                term, user_id = self._keys[i]
+                if not term.startswith(prefix):
+                    break
+                found.setdefault(user_id, self._users[user_id][0])
+                i += 1
+        return list(found.values())
+
+    def _rebuild(self, db: Session):
+        rows = db.execute(select(*SUMMARY_COLUMNS)).mappings().all()
+        keys, users = [], {}
+        for row in rows:
+            summary = dict(row)
+            terms = _terms(summary)
+            users[str(summary["id"])] = (summary, terms)
+            keys.extend((term, str(summary["id"])) for term in terms)
+        keys.sort()
+        with self._lock:
+            self._keys, self._users = keys, users
+            self._watermark = max((row["updated_at"] for row in rows if row["updated_at"]), default=None)
+        self._rebuilt_at = time.monotonic()
+
+    def _apply_changes(self, db: Session):
+        stmt = select(*SUMMARY_COLUMNS)
+        if self._watermark is not None:
+            overlap = timedelta(seconds=settings.USER_SEARCH_OVERLAP_SECONDS)
+            stmt = stmt.where(User.updated_at >= self._watermark - overlap)
+        for row in db.execute(stmt).mappings():
+            self.upsert(dict(row))
+            if row["updated_at"] and (self._watermark is None or row["updated_at"] > self._watermark):
+                self._watermark = row["updated_at"]
+
+    # Only touches the database once the refresh interval has elapsed; otherwise serves from memory
+    def ensure_fresh(self, db: Session):
+        now = time.monotonic()
+        if now - self._refreshed_at < settings.USER_SEARCH_REFRESH_SECONDS:
+            return
+        if not self._refresh_lock.acquire(blocking=not self._users):
+            return
+        try:
+            if now - self._rebuilt_at >= settings.USER_SEARCH_REBUILD_SECONDS:
+                self._rebuild(db)
+            else:
+                self._apply_changes(db)
+            self._refreshed_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+
+user_prefix_index = UserPrefixIndex()
+
+# Fuzzy search served by the pg_trgm GIN index on users(first_name, last_name, email)
+def search_users(db: Session, q: str, limit: int = 20):
+    q = q.strip()
+    score = func.greatest(
+        func.similarity(User.first_name, q),
+        func.similarity(User.last_name, q),
+        func.similarity(User.email, q),
+    )
+    pattern = f"%{q}%"
+    stmt = (
+        select(*SUMMARY_COLUMNS)
+        .where(or_(
+            User.first_name.op("%")(q), User.last_name.op("%")(q), User.email.op("%")(q),
+            User.first_name.ilike(pattern), User.last_name.ilike(pattern), User.email.ilike(pattern),
+        ))
+        .order_by(score.desc(), User.email)
+        .limit(limit)
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
+
+# Changes made through the ORM in this process reach the index as soon as they commit
+def _track_user_upsert(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("user_index_changes", []).append((target.id, {
+            "id": target.id, "email": target.email, "first_name": target.first_name,
+            "last_name": target.last_name, "updated_at": None,
+        }))
+
+def _track_user_delete(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("user_index_changes", []).append((target.id, None))
+
+event.listen(User, "after_insert", _track_user_upsert)
+event.listen(User, "after_update", _track_user_upsert)
+event.listen(User, "after_delete", _track_user_delete)
+
+@event.listens_for(Session, "after_commit")
+def _apply_user_changes(session):
+    for user_id, summary in session.info.pop("user_index_changes", []):
+        if summary is None:
+            user_prefix_index.remove(user_id)
+        else:
+            user_prefix_index.upsert(summary)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("user_index_changes", None)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+from sqlalchemy import select, text
+from sqlalchemy.orm import configure_mappers
+from core.config import settings
+from core.metrics import recording
+from core.startup import StartupProfile
+from db.database import SessionLocal
+from db.engines import engines
+from models import Birthday, User
+
+logger = logging.getLogger(__name__)
+
+# Fills the pool with `count` live connections by holding them all at once, then returns them
+def _open_connections(engine, count: int):
+    connections = [engine.connect() for _ in range(count)]
+    for connection in connections:
+        connection.execute(text("SELECT 1"))
+        connection.close()
+
+async def _open_async_connections(engine, count: int):
+    connections = [await engine.connect() for _ in range(count)]
+    for connection in connections:
+        await connection.execute(text("SELECT 1"))
+        await connection.close()
+
+async def open_pool_connections(count: int):
+    count = min(count, settings.DB_POOL_SIZE)
+    for engine in [engines.primary] + engines.replicas.engines:
+        await asyncio.to_thread(_open_connections, engine, count)
+    await _open_async_connections(engines.async_primary, count)
+
+# Hot read paths, requested with a real user and birthday so every query in them runs once. Besides
+# SQLAlchemy's per-engine compiled cache, this loads the in-process calendar and autocomplete indexes.
+def hot_paths() -> list:
+    with SessionLocal() as db:
+        user_id = db.scalar(select(User.id).limit(1))
+        birthday_id = db.scalar(select(Birthday.id).limit(1))
+    prefix = settings.API_PREFIX
+    paths = [f"{prefix}/users?limit=1", f"{prefix}/birthdays/upcoming", f"{prefix}/users/autocomplete?q=a"]
+    if user_id:
+        paths.append(f"{prefix}/users/{user_id}")
+    if birthday_id:
+        paths.append(f"{prefix}/birthdays/{birthday_id}")
+    return paths
+
+# A bare ASGI GET against the app itself: same routing, middleware and dependencies as a real request
+async def _get(app, path: str) -> int:
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(b"host", b"warmup")], "client": ("127.0.0.1", 0), "server": ("warmup", 80),
+    }
+    status = 500
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+async def request_hot_paths(app):
+    paths = await asyncio.to_thread(hot_paths)
+    token = recording.set(False)
+    try:
+        for path in paths:
+            status = await _get(app, path)
+            if status >= 400:
+                logger.warning("Warm-up request %s returned %d", path, status)
+    finally:
+        recording.reset(token)
+
+# Each step is timed into the startup report and may fail on its own (e.g. the database is briefly
+# unreachable); the worker becomes ready either way and anything left cold warms up on its first real request
+async def warm_up(app, profile: StartupProfile):
+    steps = [
+        ("mappers", lambda: asyncio.to_thread(configure_mappers)),
+        ("openapi", lambda: asyncio.to_thread(app.openapi)),
+        ("connections", lambda: open_pool_connections(settings.WARMUP_CONNECTIONS)),
+        ("hot_paths", lambda: request_hot_paths(app)),
+    ]
+    for name, step in steps:
+        with profile.timed("warmup", name):
+            try:
+                await step()
+            except Exception:
+                logger.warning("Warm-up step %s failed", name, exc_info=True)
@@ -0,0 +1,42 @@
+import os
+import pytest
+
+# Settings are read once at import time, so the test configuration goes in before any app module loads.
+# Tests that touch the database run against TEST_DATABASE_URL (a throwaway PostgreSQL database whose
+# tables are created and dropped around the session) and are skipped when it is not set.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://localhost/unused"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["WARMUP_ENABLED"] = "false"
+os.environ["METRICS_DIR"] = ""
+
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    from main import create_app
+    return TestClient(create_app())
+
+
+@pytest.fixture(scope="session")
+def database():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import models  # noqa: F401 - registers every table on Base.metadata
+    from db.database import Base
+    from db.engines import engines
+
+    Base.metadata.create_all(engines.primary)
+    yield engines.primary
+    Base.metadata.drop_all(engines.primary)
+
+
+@pytest.fixture
+def db_session(database):
+    from db.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,119 @@
+from datetime import date
+from types import SimpleNamespace
+import pytest
+from core.ids import uuid7
+from services.birthday_calendar import BirthdayCalendar, month_day_ranges
+
+
+def test_window_inside_one_year():
+    assert month_day_ranges(date(2025, 3, 1), date(2025, 3, 31)) == [((3, 1), (3, 31))]
+
+
+def test_single_day():
+    assert month_day_ranges(date(2025, 7, 14), date(2025, 7, 14)) == [((7, 14), (7, 14))]
+
+
+def test_window_wraps_into_january():
+    assert month_day_ranges(date(2025, 12, 20), date(2026, 1, 10)) == [((12, 20), (12, 31)), ((1, 1), (1, 10))]
+
+
+def test_feb_28_in_a_common_year_includes_feb_29_birthdays():
+    assert month_day_ranges(date(2025, 2, 1), date(2025, 2, 28)) == [((2, 1), (2, 29))]
+
+
+def test_feb_28_in_a_leap_year_stops_before_feb_29():
+    assert month_day_ranges(date(2024, 2, 1), date(2024, 2, 28)) == [((2, 1), (2, 28))]
+
+
+def test_feb_29_in_a_leap_year():
+    assert month_day_ranges(date(2024, 2, 20), date(2024, 2, 29)) == [((2, 20), (2, 29))]
+
+
+def test_wrapping_window_ending_on_feb_28_of_a_common_year():
+    assert month_day_ranges(date(2024, 12, 1), date(2025, 2, 28)) == [((12, 1), (12, 31)), ((1, 1), (2, 29))]
+
+
+def test_a_year_or_more_covers_every_day():
+    assert month_day_ranges(date(2025, 6, 1), date(2026, 6, 1)) == [((1, 1), (12, 31))]
+    assert month_day_ranges(date(2024, 1, 1), date(2024, 12, 31)) == [((1, 1), (12, 31))]
+
+
+def test_end_before_start_is_rejected():
+    with pytest.raises(ValueError):
+        month_day_ranges(date(2025, 5, 2), date(2025, 5, 1))
+
+
+def _row(birth_date: date, email: str, status: str = "planned"):
+    return SimpleNamespace(
+        id=uuid7(), user_id=uuid7(), date=birth_date, status=status, email=email, first_name=None, last_name=None,
+    )
+
+
+def _emails(entries: list) -> list:
+    return [entry["user"]["email"] for entry in entries]
+
+
+@pytest.fixture
+def calendar():
+    calendar = BirthdayCalendar()
+    calendar.rebuild([
+        _row(date(1990, 1, 3), "january@symphony.is"),
+        _row(date(1985, 3, 15), "march@symphony.is"),
+        _row(date(1992, 2, 29), "leapling@symphony.is"),
+        _row(date(1988, 12, 28), "december@symphony.is"),
+    ])
+    return calendar
+
+
+def test_between_returns_entries_in_date_order(calendar):
+    entries = calendar.between(date(2025, 1, 1), date(2025, 3, 31))
+    assert _emails(entries) == ["january@symphony.is", "leapling@symphony.is", "march@symphony.is"]
+    assert [entry["occurs_on"] for entry in entries] == [date(2025, 1, 3), date(2025, 2, 28), date(2025, 3, 15)]
+    assert entries[0]["days_until"] == 2
+
+
+def test_between_wraps_into_january(calendar):
+    entries = calendar.between(date(2025, 12, 20), date(2026, 1, 10))
+    assert _emails(entries) == ["december@symphony.is", "january@symphony.is"]
+    assert entries[1]["occurs_on"] == date(2026, 1, 3)
+
+
+def test_put_moves_an_entry_to_its_new_date(calendar):
+    row = _row(date(1995, 6, 1), "june@symphony.is")
+    calendar.upsert(row)
+    assert _emails(calendar.between(date(2025, 6, 1), date(2025, 6, 30))) == ["june@symphony.is"]
+
+    row.date = date(1995, 7, 1)
+    calendar.upsert(row)
+    assert calendar.between(date(2025, 6, 1), date(2025, 6, 30)) == []
+    assert _emails(calendar.between(date(2025, 7, 1), date(2025, 7, 1))) == ["june@symphony.is"]
+    assert calendar.size == 5
+
+
+def test_discard_removes_only_that_birthday(calendar):
+    twin = _row(date(1985, 3, 15), "twin@symphony.is")
+    calendar.upsert(twin)
+    calendar.remove(twin.id)
+    calendar.remove(twin.id)
+    assert _emails(calendar.between(date(2025, 3, 15), date(2025, 3, 15))) == ["march@symphony.is"]
+    assert calendar.size == 4
+
+
+# The ETag follows the version, whichever clock stamped the change
+def test_version_changes_with_every_applied_change(calendar):
+    row = _row(date(2000, 8, 8), "august@symphony.is")
+    version = calendar.version
+    calendar.upsert(row)
+    assert calendar.version > version
+
+    version = calendar.version
+    calendar.upsert(row)
+    assert calendar.version == version
+
+    calendar.apply_user({"id": row.user_id, "email": "renamed@symphony.is", "first_name": None, "last_name": None})
+    assert calendar.version > version
+    assert _emails(calendar.between(date(2025, 8, 8), date(2025, 8, 8))) == ["renamed@symphony.is"]
+
+    version = calendar.version
+    calendar.remove(row.id)
+    assert calendar.version > version
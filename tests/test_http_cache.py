@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from fastapi import Response
+from starlette.requests import Request
+from core.http_cache import conditional_response, make_etag
+
+MODIFIED = datetime(2025, 10, 7, 13, 17, 53, 500000, tzinfo=timezone.utc)
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_sets_validators_and_cache_policy():
+    response = Response()
+    assert conditional_response(_request(), response, "birthday", MODIFIED, "id") is None
+    assert response.headers["etag"] == make_etag(MODIFIED, "id")
+    assert response.headers["last-modified"] == "Tue, 07 Oct 2025 13:17:53 GMT"
+    assert response.headers["cache-control"] == "private, max-age=30, must-revalidate"
+
+
+def test_matching_etag_is_not_modified():
+    etag = make_etag(MODIFIED, "id")
+    for header in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        not_modified = conditional_response(_request(if_none_match=header), Response(), "birthday", MODIFIED, "id")
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+
+
+def test_etag_changes_with_any_part():
+    assert make_etag(MODIFIED, "id", 1) != make_etag(MODIFIED, "id", 2)
+    assert make_etag(MODIFIED, "id") != make_etag(MODIFIED.replace(microsecond=0), "id")
+    stale = make_etag(MODIFIED, "id", 1)
+    assert conditional_response(_request(if_none_match=stale), Response(), "birthday", MODIFIED, "id", 2) is None
+
+
+def test_if_modified_since_compares_whole_seconds():
+    since = format_datetime(MODIFIED, usegmt=True)
+    assert conditional_response(_request(if_modified_since=since), Response(), "user", MODIFIED).status_code == 304
+    later = MODIFIED.replace(second=54)
+    assert conditional_response(_request(if_modified_since=since), Response(), "user", later) is None
+    assert conditional_response(_request(if_modified_since="garbage"), Response(), "user", MODIFIED) is None
+
+
+# If-None-Match wins over If-Modified-Since, as RFC 9110 requires
+def test_etag_takes_precedence_over_date():
+    request = _request(if_none_match='"other"', if_modified_since=format_datetime(MODIFIED, usegmt=True))
+    assert conditional_response(request, Response(), "user", MODIFIED) is None
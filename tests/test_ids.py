@@ -0,0 +1,55 @@
+import time
+import uuid
+import pytest
+from sqlalchemy import text
+from core import ids
+from core.ids import uuid7
+
+
+def _milliseconds(value: uuid.UUID) -> int:
+    return value.int >> 80
+
+
+def test_version_and_variant_bits():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_timestamp_is_unix_milliseconds():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= _milliseconds(value) <= after + 1
+
+
+def test_ids_are_unique_and_sort_in_creation_order():
+    values = [uuid7() for _ in range(10_000)]
+    assert len(set(values)) == len(values)
+    assert values == sorted(values)
+    assert [str(value) for value in values] == sorted(str(value) for value in values)
+
+
+# Within one millisecond the counter keeps ids ordered; when it runs out the next millisecond is borrowed
+def test_ordering_survives_a_frozen_clock(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000 * 1_000_000)
+    values = [uuid7() for _ in range(5_000)]
+    assert values == sorted(values)
+    assert all(value.version == 7 and value.variant == uuid.RFC_4122 for value in values)
+    assert _milliseconds(values[-1]) > _milliseconds(values[0])
+
+
+def test_ordering_survives_the_clock_going_back(monkeypatch):
+    first = uuid7()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: (_milliseconds(first) - 1_000) * 1_000_000)
+    assert uuid7() > first
+
+
+def test_sql_function_matches_the_layout(database):
+    if database.dialect.name != "postgresql":
+        pytest.skip("uuid_generate_v7() is a PostgreSQL function")
+    with database.connect() as connection:
+        value = uuid.UUID(str(connection.execute(text("SELECT uuid_generate_v7()")).scalar_one()))
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert abs(_milliseconds(value) - time.time_ns() // 1_000_000) < 60_000
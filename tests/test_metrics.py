@@ -0,0 +1,52 @@
+import os
+import pytest
+from core.metrics import LATENCY_BUCKETS, MetricsRegistry, render
+
+DEAD_PID = 2 ** 22 + 1  # above Linux's pid_max, so never a live process
+
+
+def _snapshot(pid, requests, durations, in_flight):
+    registry = MetricsRegistry()
+    labels = {"route": "/api/birthdays/{birthday_id}", "method": "GET", "status": "200"}
+    registry.inc("http_requests_total", labels, requests)
+    for duration in durations:
+        registry.observe("http_request_duration_seconds", labels, duration)
+    registry.in_flight = in_flight
+    return {**registry.snapshot(in_event_loop=False), "pid": pid}
+
+
+def _samples(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+LABELS = 'method="GET",route="/api/birthdays/{birthday_id}",status="200"'
+
+
+def test_counters_and_histograms_are_summed_across_workers():
+    samples = _samples(render([_snapshot(os.getpid(), 3, [0.003, 0.2], 1), _snapshot(DEAD_PID, 2, [0.2, 20.0], 0)]))
+    assert samples[f"http_requests_total{{{LABELS}}}"] == 5
+    assert samples[f"http_request_duration_seconds_count{{{LABELS}}}"] == 4
+    assert samples[f"http_request_duration_seconds_sum{{{LABELS}}}"] == pytest.approx(20.403)
+    # Buckets are cumulative and end with +Inf
+    assert samples[f'http_request_duration_seconds_bucket{{le="0.005",{LABELS}}}'] == 1
+    assert samples[f'http_request_duration_seconds_bucket{{le="0.25",{LABELS}}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{le="{LATENCY_BUCKETS[-1]}",{LABELS}}}'] == 3
+    assert samples[f'http_request_duration_seconds_bucket{{le="+Inf",{LABELS}}}'] == 4
+
+
+def test_gauges_are_per_live_worker():
+    samples = _samples(render([_snapshot(os.getpid(), 1, [], 2), _snapshot(DEAD_PID, 1, [], 7)]))
+    assert samples[f'http_requests_in_flight{{pid="{os.getpid()}"}}'] == 2
+    assert f'http_requests_in_flight{{pid="{DEAD_PID}"}}' not in samples
+
+
+def test_every_metric_is_declared():
+    text = render([_snapshot(os.getpid(), 1, [0.1], 0)])
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert "# TYPE http_requests_in_flight gauge" in text
+    assert text.endswith("\n")
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+import pytest
+from services.notification_senders import NOTIFICATION_TYPES, render_message
+
+
+def _user(email, first_name=None, last_name=None):
+    return SimpleNamespace(email=email, first_name=first_name, last_name=last_name)
+
+
+def _notification(type, birthday=None):
+    return SimpleNamespace(type=type, user=_user("bob@symphony.is", "Bob"), birthday=birthday)
+
+
+@pytest.mark.parametrize("type", NOTIFICATION_TYPES)
+def test_every_type_has_a_message(type):
+    subject, body = render_message(_notification(type))
+    assert subject and body.startswith("Hi Bob,")
+
+
+def test_collection_messages_name_the_celebrant():
+    birthday = SimpleNamespace(user=_user("cara@symphony.is", "Cara", "Lee"))
+    subject, body = render_message(_notification("gift_invite", birthday))
+    assert subject == "Chip in for Cara Lee's gift"
+    assert "Cara Lee's birthday gift" in render_message(_notification("payment_request", birthday))[1]
+
+
+def test_unknown_type_is_an_error():
+    with pytest.raises(ValueError):
+        render_message(_notification("carrier_pigeon"))
@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime, timezone
+import pytest
+from fastapi import HTTPException
+from core.ids import uuid7
+from core.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 10, 7, 13, 17, 53, 123456, tzinfo=timezone.utc)
+    id = uuid7()
+    cursor = encode_cursor(created_at, id)
+    assert decode_cursor(cursor) == (created_at, id)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2025, 1, 1, tzinfo=timezone.utc), uuid.UUID(int=2 ** 128 - 1))
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bnVsbA", "WyJ4IiwgInkiXQ", "WzFd"])
+def test_invalid_cursor_is_a_client_error(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
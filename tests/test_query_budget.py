@@ -0,0 +1,69 @@
+from datetime import date
+from decimal import Decimal
+import pytest
+from sqlalchemy import create_engine, text
+from db.instrumentation import QueryBudgetExceeded, instrument_engine, query_budget
+from models import Birthday, Contribution, Organizer, User
+
+
+@pytest.fixture
+def engine():
+    return instrument_engine(create_engine("sqlite://"))
+
+
+def test_budget_counts_statements(engine):
+    with engine.connect() as connection:
+        with query_budget(2) as stats:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    assert stats.count == 2
+
+
+def test_budget_exceeded(engine):
+    with engine.connect() as connection:
+        with pytest.raises(QueryBudgetExceeded):
+            with query_budget(1):
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+
+
+def test_repeated_statement_is_reported_as_n_plus_one(engine):
+    with engine.connect() as connection:
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            with query_budget(100):
+                for i in range(10):
+                    connection.execute(text("SELECT :i"), {"i": i})
+
+        with query_budget(100, allow_n_plus_one=True) as stats:
+            for i in range(10):
+                connection.execute(text("SELECT :i"), {"i": i})
+    assert stats.count == 10
+
+
+# Requests that fail validation are answered without touching the database
+def test_invalid_calendar_window_runs_no_queries(client):
+    with query_budget(0):
+        response = client.get("/api/birthdays/calendar", params={"start": "2025-05-02", "end": "2025-05-01"})
+    assert response.status_code == 400
+
+
+# The detail ETag check, the birthday with its celebrant and organizer, then contributions with their
+# contributors: three statements however many people chipped in
+def test_birthday_detail_query_count_does_not_grow_with_contributions(client, db_session):
+    celebrant = User(email="celebrant@symphony.is", first_name="Ana")
+    organizer = User(email="organizer@symphony.is", first_name="Marko")
+    contributors = [User(email=f"contributor{i}@symphony.is") for i in range(10)]
+    birthday = Birthday(user=celebrant, date=date(1990, 5, 17))
+    birthday.organizer = Organizer(organizer=organizer)
+    birthday.contributions = [Contribution(contributor=user, amount=Decimal("500")) for user in contributors]
+    db_session.add(birthday)
+    db_session.commit()
+
+    url = f"/api/birthdays/{birthday.id}"
+
+    with query_budget(3):
+        response = client.get(url)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["user"]["email"] == "celebrant@symphony.is"
+    assert len(body["contributions"]) == 10
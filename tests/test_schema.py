@@ -0,0 +1,35 @@
+from datetime import date
+from decimal import Decimal
+import pytest
+from sqlalchemy import update
+from db.schema import upgrade_schema
+from models import Birthday, Contribution, User
+
+
+@pytest.fixture
+def postgres(database):
+    if database.dialect.name != "postgresql":
+        pytest.skip("upgrade_schema targets PostgreSQL")
+    return database
+
+
+# On an up-to-date schema the upgrade only backfills totals that read 0 for existing contributions
+def test_upgrade_is_idempotent_and_backfills_totals(postgres, db_session):
+    celebrant = User(email="schema-celebrant@symphony.is")
+    birthday = Birthday(user=celebrant, date=date(1991, 4, 1))
+    birthday.contributions = [
+        Contribution(contributor=User(email=f"schema-contributor{i}@symphony.is"), amount=Decimal("10"), paid=i == 0)
+        for i in range(3)
+    ]
+    db_session.add(birthday)
+    db_session.commit()
+    db_session.execute(
+        update(Birthday).where(Birthday.id == birthday.id).values(pledged_total=0, paid_total=0, contributor_count=0)
+    )
+    db_session.commit()
+
+    assert upgrade_schema(postgres) == {"created_tables": [], "backfilled_totals": 1}
+    assert upgrade_schema(postgres) == {"created_tables": [], "backfilled_totals": 0}
+
+    db_session.refresh(birthday)
+    assert (birthday.pledged_total, birthday.paid_total, birthday.contributor_count) == (Decimal("30"), Decimal("10"), 3)
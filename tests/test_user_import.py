@@ -0,0 +1,49 @@
+import csv
+import io
+import pytest
+from services.user_import import UserImportError, _iter_records, _normalize
+
+
+def _records(data: bytes, fmt: str) -> list:
+    return list(_iter_records(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", newline=""), fmt))
+
+
+def test_csv_and_ndjson_records():
+    assert _records(b"\xef\xbb\xbfemail,first_name\r\na@symphony.is,Ana\r\n", "csv") == [
+        {"email": "a@symphony.is", "first_name": "Ana"},
+    ]
+    assert _records(b'{"email": "a@symphony.is"}\n\n{"email": "b@symphony.is"}\n', "ndjson") == [
+        {"email": "a@symphony.is"}, {"email": "b@symphony.is"},
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_non_utf8_upload_names_the_line(fmt):
+    lines = ["email"] if fmt == "csv" else []
+    lines += ['{"email": "user%d@symphony.is"}' % i if fmt == "ndjson" else f"user{i}@symphony.is" for i in range(20000)]
+    data = ("\n".join(lines) + "\n").encode() + "José@symphony.is\n".encode("latin-1")
+    with pytest.raises(UserImportError, match=f"Line {len(lines) + 1} is not UTF-8"):
+        _records(data, fmt)
+
+
+def test_malformed_csv_names_the_record():
+    limit = csv.field_size_limit(20)
+    try:
+        with pytest.raises(UserImportError, match="starting on line 3"):
+            _records(b"email\na@symphony.is\n" + b"x" * 50 + b"\n", "csv")
+    finally:
+        csv.field_size_limit(limit)
+
+
+def test_invalid_json_names_the_line():
+    with pytest.raises(UserImportError, match="line 2"):
+        _records(b'{"email": "a@symphony.is"}\n{"email": \n', "ndjson")
+
+
+def test_normalize_accepts_numbers_and_rejects_structures():
+    assert _normalize({"email": " A@Symphony.is ", "first_name": 42, "last_name": None}, 1)[:4] == (
+        "a@symphony.is", "42", None, "user",
+    )
+    for value in ({"x": 1}, ["x"], True):
+        with pytest.raises(UserImportError, match="Invalid first_name in record 7"):
+            _normalize({"email": "a@symphony.is", "first_name": value}, 7)
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from core.config import settings
+from core.ids import uuid7
+from services.user_search import UserPrefixIndex
+
+
+def _user(email: str, first_name=None, last_name=None, updated_at=None) -> dict:
+    return {"id": uuid7(), "email": email, "first_name": first_name, "last_name": last_name, "updated_at": updated_at}
+
+
+def _emails(results: list) -> list:
+    return [user["email"] for user in results]
+
+
+@pytest.fixture
+def index():
+    index = UserPrefixIndex()
+    for user in (
+        _user("ana.petrovic@symphony.is", "Ana", "Petrovic"),
+        _user("andrej@symphony.is", "Andrej", "Markovic"),
+        _user("marko@symphony.is", "Marko", "Anic"),
+    ):
+        index.upsert(user)
+    return index
+
+
+def test_prefix_matches_first_name_last_name_and_email(index):
+    # Ordered by the matching term: "ana", "andrej", "anic"
+    assert _emails(index.search("an")) == ["ana.petrovic@symphony.is", "andrej@symphony.is", "marko@symphony.is"]
+    assert _emails(index.search("markov")) == ["andrej@symphony.is"]
+    assert _emails(index.search("petrovic ana")) == ["ana.petrovic@symphony.is"]
+
+
+def test_search_is_case_insensitive_and_ignores_blank_queries(index):
+    assert _emails(index.search("  ANDREJ ")) == ["andrej@symphony.is"]
+    assert index.search("   ") == []
+    assert index.search("zz") == []
+
+
+def test_limit_counts_users_not_terms(index):
+    assert len(index.search("a", limit=2)) == 2
+
+
+def test_upsert_replaces_the_old_terms(index):
+    user = _user("jelena@symphony.is", "Jelena", "Ilic")
+    index.upsert(user)
+    index.upsert({**user, "last_name": "Jovanovic"})
+    assert index.search("ilic") == []
+    assert _emails(index.search("jovan")) == ["jelena@symphony.is"]
+
+
+def test_remove(index):
+    user = _user("stefan@symphony.is", "Stefan")
+    index.upsert(user)
+    index.remove(user["id"])
+    index.remove(user["id"])
+    assert index.search("stefan") == []
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self
+
+    def mappings(self):
+        return []
+
+
+# Rows stamped before the watermark by a transaction that committed late are still picked up
+def test_refresh_looks_back_past_the_watermark():
+    index = UserPrefixIndex()
+    watermark = datetime(2025, 10, 7, 12, 0, tzinfo=timezone.utc)
+    index._watermark = watermark
+    db = _RecordingSession()
+    index._apply_changes(db)
+    (statement,) = db.statements
+    assert watermark - timedelta(seconds=settings.USER_SEARCH_OVERLAP_SECONDS) in statement.compile().params.values()